@@ -0,0 +1,91 @@
+"""JSON API против HTML-ленты на одной и той же странице публикаций.
+
+Запросы идут через тестовый клиент со всеми middleware от имени
+вошедшего пользователя, чтобы HTML не отдавался из кеша страниц.
+Отдельно сравнивается сама сериализация: словари из values() против
+экземпляров моделей.
+
+    python benchmarks/api_serializer.py --posts 1000 --page-size 10
+"""
+import argparse
+import json
+
+from common import bench_database, seed, timed
+
+from django.core.cache import caches
+from django.core.serializers.json import DjangoJSONEncoder
+from django.test import Client
+
+from blog.api import POST_FIELDS, serialize
+from blog.models import Post
+
+
+def serialize_models(posts):
+    """Ответ того же вида, собранный из экземпляров моделей."""
+    return [{
+        'id': post.id,
+        'title': post.title,
+        'text': post.text,
+        'pub_date': post.pub_date,
+        'author': post.author.username,
+        'category': post.category.slug,
+        'location': (
+            post.location.name
+            if post.location and post.location.is_published else None
+        ),
+        'image': post.image.url if post.image else None,
+        'comment_count': post.comment_count,
+    } for post in posts]
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--posts', type=int, default=1000)
+    parser.add_argument('--page-size', type=int, default=10)
+    parser.add_argument('--repeat', type=int, default=50)
+    args = parser.parse_args()
+
+    with bench_database():
+        users, _ = seed(posts=args.posts)
+        client = Client()
+        client.force_login(users[0])
+        fragments = caches['template_fragments']
+
+        def html(warm):
+            if not warm:
+                fragments.clear()
+            assert client.get('/').status_code == 200
+
+        def api(query=''):
+            url = f'/api/v1/posts/?page_size={args.page_size}{query}'
+            assert client.get(url).status_code == 200
+
+        print(f'HTML feed, cold cards: '
+              f'{timed(lambda: html(False), args.repeat):.2f} ms')
+        print(f'HTML feed, warm cards: '
+              f'{timed(lambda: html(True), args.repeat):.2f} ms')
+        print(f'API, all fields: {timed(api, args.repeat):.2f} ms')
+        print(f'API, fields=id,title: '
+              f'{timed(lambda: api("&fields=id,title"), args.repeat):.2f} ms')
+
+        published = Post.objects.published().order_by('-pub_date', '-id')
+        paths = [path for f in POST_FIELDS.values() for path in f.paths]
+
+        def from_values():
+            rows = published.values(*paths)[:args.page_size]
+            json.dumps(serialize(rows, POST_FIELDS), cls=DjangoJSONEncoder)
+
+        def from_models():
+            posts = published.select_related(
+                'author', 'category', 'location'
+            )[:args.page_size]
+            json.dumps(serialize_models(posts), cls=DjangoJSONEncoder)
+
+        print(f'serializer, values(): '
+              f'{timed(from_values, args.repeat):.2f} ms')
+        print(f'serializer, model instances: '
+              f'{timed(from_models, args.repeat):.2f} ms')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,104 @@
+"""Общая обвязка для запуска бенчмарков вне тестов.
+
+Скрипты запускаются из корня проекта: ``python benchmarks/<name>.py``.
+Данные создаются во временной тестовой базе и удаляются после прогона.
+"""
+import os
+import sys
+import time
+from contextlib import contextmanager
+from datetime import timedelta
+from pathlib import Path
+
+ROOT_DIR = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT_DIR / 'blogicum'))
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'blogicum.settings')
+
+import django  # noqa: E402
+
+django.setup()
+
+from django.contrib.auth import get_user_model  # noqa: E402
+from django.db import connection  # noqa: E402
+from django.test.utils import (  # noqa: E402
+    setup_test_environment, teardown_test_environment,
+)
+from django.utils import timezone  # noqa: E402
+
+from blog.models import Category, Comment, Location, Post  # noqa: E402
+
+User = get_user_model()
+
+
+@contextmanager
+def bench_database(name=None):
+    """Временная база со всеми миграциями проекта.
+
+    По умолчанию SQLite создаёт её в памяти; ``name`` задаёт файл, если
+    к базе ходят из нескольких потоков.
+    """
+    if name:
+        connection.settings_dict['TEST']['NAME'] = name
+    setup_test_environment()
+    old_name = connection.creation.create_test_db(verbosity=0)
+    try:
+        yield
+    finally:
+        connection.creation.destroy_test_db(old_name, verbosity=0)
+        teardown_test_environment()
+
+
+def seed(posts=1000, authors=10, categories=5, comments=0,
+         batch_size=10000):
+    """Создаёт публикации с убывающими датами и, по желанию, комментарии."""
+    users = [
+        User.objects.create(username=f'bench{i}') for i in range(authors)
+    ]
+    cats = [
+        Category.objects.create(
+            title=f'Категория {i}', slug=f'bench-{i}',
+            description='', is_published=bool(i % 5),
+        )
+        for i in range(categories)
+    ]
+    location = Location.objects.create(name='Планета Земля')
+    now = timezone.now()
+    for start in range(0, posts, batch_size):
+        Post.objects.bulk_create(
+            Post(
+                title=f'Публикация {i}',
+                text='Текст публикации. ' * 20,
+                pub_date=now - timedelta(minutes=i - 100),
+                author=users[i % authors],
+                category=cats[i // authors % categories],
+                location=location,
+                is_published=bool(i % 7),
+            )
+            for i in range(start, min(start + batch_size, posts))
+        )
+    if comments:
+        post = Post.objects.order_by('pk').first()
+        Comment.objects.bulk_create(
+            Comment(text=f'Комментарий {i}', post=post,
+                    author=users[i % authors])
+            for i in range(comments)
+        )
+    return users, cats
+
+
+def timed(func, repeat=20):
+    """Лучшее время одного вызова в миллисекундах."""
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        elapsed = (time.perf_counter() - start) * 1000
+        best = elapsed if best is None else min(best, elapsed)
+    return best
+
+
+def explain(queryset):
+    sql, params = queryset.query.sql_with_params()
+    with connection.cursor() as cursor:
+        cursor.execute(f'EXPLAIN QUERY PLAN {sql}', params)
+        return [row[-1] for row in cursor.fetchall()]
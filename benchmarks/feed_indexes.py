@@ -0,0 +1,62 @@
+"""Планы запросов ленты и время первой/глубокой страницы.
+
+    python benchmarks/feed_indexes.py --posts 1000000
+"""
+import argparse
+
+from common import Comment, bench_database, explain, seed, timed
+
+from django.views.generic import ListView
+
+from blog.mixins import PostsMixin
+from blog.paginators import CursorPaginator
+
+
+class FeedView(PostsMixin, ListView):
+    pass
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--posts', type=int, default=1_000_000)
+    parser.add_argument('--comments', type=int, default=20_000)
+    args = parser.parse_args()
+
+    with bench_database():
+        users, cats = seed(posts=args.posts, comments=args.comments)
+        mixin = FeedView()
+        post = Comment.objects.first().post
+        cases = (
+            ('index', mixin.get_queryset(), 'post_feed_idx'),
+            ('category', mixin.get_queryset().filter(category=cats[1]),
+             'post_category_feed_idx'),
+            ('profile (owner)', mixin.all_posts().filter(author=users[0]),
+             'post_author_feed_idx'),
+            ('profile', mixin.get_queryset().filter(author=users[0]),
+             'post_author_feed_idx'),
+            ('comments', post.comments.all(), 'comment_post_created_idx'),
+        )
+        print(f'posts={args.posts} comments={args.comments}')
+        for name, queryset, index in cases:
+            plan = explain(queryset[:10])
+            used = any(index in line for line in plan)
+            first = timed(lambda: list(queryset[:10]))
+            print(f'\n{name}: {"uses" if used else "MISSES"} {index}, '
+                  f'first page {first:.2f} ms')
+            for line in plan:
+                print(f'  {line}')
+            if name == 'comments':
+                continue
+            depth = queryset.count() // 2
+            paginator = CursorPaginator(queryset, 10)
+            cursor = paginator.encode_cursor(queryset[depth])
+            keyset = timed(lambda: list(paginator.page(after=cursor)))
+            offset = timed(
+                lambda: list(queryset[depth:depth + 10]), repeat=3
+            )
+            print(f'  page {depth // 10}: keyset {keyset:.2f} ms, '
+                  f'offset {offset:.2f} ms')
+
+
+if __name__ == '__main__':
+    main()
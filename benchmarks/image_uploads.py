@@ -0,0 +1,138 @@
+"""Память и время разбора одновременных загрузок больших файлов.
+
+Тела запросов отдаются парсеру по частям из файла на диске, как их
+читает сервер приложений, поэтому в памяти процесса бенчмарка их нет.
+Пиковая память — рост кучи Python по tracemalloc за время всех
+загрузок сразу; перекодирование идёт в процессах пула и сюда не
+входит.
+
+    python benchmarks/image_uploads.py --uploads 50 --size-mb 20
+"""
+import argparse
+import os
+import tempfile
+import time
+import tracemalloc
+from concurrent.futures import ThreadPoolExecutor
+from io import BytesIO
+
+from common import ROOT_DIR  # noqa: F401
+
+from django.conf import settings
+from django.core.files.uploadhandler import (MemoryFileUploadHandler,
+                                             TemporaryFileUploadHandler)
+from django.core.handlers.wsgi import WSGIRequest
+from PIL import Image
+
+BOUNDARY = 'benchboundary'
+
+
+class MultipartStream:
+    """Тело multipart-запроса с одним файлом, читаемое по частям."""
+
+    def __init__(self, path, name):
+        self.parts = [
+            BytesIO(
+                f'--{BOUNDARY}\r\nContent-Disposition: form-data; '
+                f'name="image"; filename="{name}"\r\n'
+                'Content-Type: application/octet-stream\r\n\r\n'.encode()
+            ),
+            open(path, 'rb'),
+            BytesIO(f'\r\n--{BOUNDARY}--\r\n'.encode()),
+        ]
+        self.length = sum(
+            len(part.getvalue()) if isinstance(part, BytesIO)
+            else os.path.getsize(path)
+            for part in self.parts
+        )
+
+    def read(self, size=-1):
+        data = b''
+        while self.parts and (size < 0 or len(data) < size):
+            chunk = self.parts[0].read(-1 if size < 0 else size - len(data))
+            if not chunk:
+                self.parts.pop(0).close()
+            data += chunk
+        return data
+
+
+def upload(path, name, handlers):
+    stream = MultipartStream(path, name)
+    request = WSGIRequest({
+        'REQUEST_METHOD': 'POST',
+        'PATH_INFO': '/posts/create/',
+        'SERVER_NAME': 'bench',
+        'SERVER_PORT': '80',
+        'wsgi.url_scheme': 'http',
+        'CONTENT_TYPE': f'multipart/form-data; boundary={BOUNDARY}',
+        'CONTENT_LENGTH': str(stream.length),
+        'wsgi.input': stream,
+    })
+    if handlers is not None:
+        request.upload_handlers = [
+            handler(request) for handler in handlers
+        ]
+    file = request.FILES.get('image')
+    if file is not None:
+        file.close()
+    return getattr(request, 'upload_errors', {}).get('image', 'принят')
+
+
+def run(label, path, name, uploads, handlers=None):
+    tracemalloc.reset_peak()
+    base = tracemalloc.get_traced_memory()[0]
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=uploads) as pool:
+        results = list(pool.map(
+            lambda _: upload(path, name, handlers), range(uploads)
+        ))
+    elapsed = time.perf_counter() - start
+    peak = (tracemalloc.get_traced_memory()[1] - base) / 2 ** 20
+    print(f'{label}: {elapsed:.2f} s, peak {peak:.1f} MB, '
+          f'{results[0]!r}')
+
+
+def make_payloads(directory, size):
+    noise = os.path.join(directory, 'noise.bin')
+    with open(noise, 'wb') as output:
+        for _ in range(size // 2 ** 20):
+            output.write(os.urandom(2 ** 20))
+    # Шум почти не сжимается: сторона подбирается под нужный объём.
+    # EXIF с моделью камеры заставляет перекодировать файл при приёме.
+    photo = os.path.join(directory, 'photo.jpg')
+    exif = Image.Exif()
+    exif[0x010F] = 'Camera'
+    side = int((size / 3) ** 0.5)
+    for _ in range(3):
+        Image.frombytes(
+            'RGB', (side, side), os.urandom(side * side * 3)
+        ).save(photo, 'JPEG', quality=95, exif=exif.tobytes())
+        side = int(side * (size / os.path.getsize(photo)) ** 0.5)
+    return noise, photo
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--uploads', type=int, default=50)
+    parser.add_argument('--size-mb', type=int, default=20)
+    args = parser.parse_args()
+
+    default_handlers = [MemoryFileUploadHandler, TemporaryFileUploadHandler]
+    with tempfile.TemporaryDirectory() as directory:
+        noise, photo = make_payloads(directory, args.size_mb * 2 ** 20)
+        print(f'{args.uploads} uploads, photo '
+              f'{os.path.getsize(photo) / 2 ** 20:.1f} MB, '
+              f'limit {settings.POST_IMAGE_MAX_SIZE / 2 ** 20:.0f} MB')
+        tracemalloc.start()
+        run('not an image, default handlers', noise, 'photo.jpg',
+            args.uploads, default_handlers)
+        run('not an image', noise, 'photo.jpg', args.uploads)
+        run('over limit, default handlers', photo, 'photo.jpg',
+            args.uploads, default_handlers)
+        run('over limit', photo, 'photo.jpg', args.uploads)
+        settings.POST_IMAGE_MAX_SIZE = (args.size_mb + 5) * 2 ** 20
+        run('accepted, re-encoded', photo, 'photo.jpg', args.uploads)
+
+
+if __name__ == '__main__':
+    main()
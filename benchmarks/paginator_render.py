@@ -0,0 +1,39 @@
+"""Размер и время рендеринга includes/paginator.html на длинной ленте.
+
+    python benchmarks/paginator_render.py --pages 50000
+"""
+import argparse
+
+from common import timed
+
+from django.core.paginator import Paginator
+from django.template.loader import get_template
+from django.test import RequestFactory
+
+from blog.mixins import PostsMixin
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--pages', type=int, default=50_000)
+    args = parser.parse_args()
+
+    paginator = Paginator(range(args.pages * 10), 10)
+    template = get_template('includes/paginator.html')
+    request = RequestFactory().get('/')
+    for number in (1, args.pages // 2, args.pages):
+        page = paginator.page(number)
+        context = {
+            'page_obj': page,
+            'paginator': paginator,
+            'page_range': PostsMixin().get_page_range(page),
+            'request': request,
+        }
+        html = template.render(context)
+        elapsed = timed(lambda: template.render(context), repeat=5)
+        print(f'page {number}/{args.pages}: {len(html.encode())} bytes, '
+              f'{elapsed:.2f} ms')
+
+
+if __name__ == '__main__':
+    main()
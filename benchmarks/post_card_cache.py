@@ -0,0 +1,42 @@
+"""Рендеринг страницы ленты с пустым и заполненным кешем карточек.
+
+    python benchmarks/post_card_cache.py --per-page 10
+"""
+import argparse
+
+from common import bench_database, seed, timed
+
+from django.core.cache import caches
+from django.template.loader import get_template
+from django.test import RequestFactory
+
+from blog.models import Post
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--per-page', type=int, default=10)
+    parser.add_argument('--repeat', type=int, default=50)
+    args = parser.parse_args()
+
+    with bench_database():
+        seed(posts=args.per_page * 2)
+        posts = list(Post.objects.for_cards()[:args.per_page])
+        template = get_template('blog/index.html')
+        request = RequestFactory().get('/')
+        request.user = posts[0].author
+        context = {'page_obj': posts, 'request': request}
+        fragments = caches['template_fragments']
+
+        def cold():
+            fragments.clear()
+            template.render(context, request)
+
+        print(f'cold cards: {timed(cold, args.repeat):.2f} ms')
+        template.render(context, request)
+        warm = timed(lambda: template.render(context, request), args.repeat)
+        print(f'warm cards: {warm:.2f} ms')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,64 @@
+"""Стоимость сборки и компиляции выборки ленты на один запрос.
+
+Сравнивается сборка выборки с нуля, как было в представлениях, и
+копия заранее собранной ``PostsMixin.queryset``. Отдельно замеряется
+чтение страницы ленты с полным текстом и с отрывком для карточки.
+
+    python benchmarks/post_queryset.py --posts 5000 --text-words 2000
+"""
+import argparse
+
+from common import bench_database, seed, timed
+
+from django.db import connection
+from django.utils import timezone
+
+from blog.mixins import PostsMixin
+from blog.models import Post
+
+
+def from_scratch():
+    return Post.objects.select_related(
+        'category', 'author', 'location'
+    ).order_by('-pub_date', '-id').filter(
+        is_published=True,
+        category__is_published=True,
+        pub_date__lte=timezone.now(),
+    )
+
+
+def from_prebuilt():
+    return PostsMixin.queryset.all().published()
+
+
+def compile_sql(queryset):
+    return queryset.query.get_compiler(connection=connection).as_sql()
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--posts', type=int, default=5000)
+    parser.add_argument('--text-words', type=int, default=2000)
+    parser.add_argument('--repeat', type=int, default=2000)
+    args = parser.parse_args()
+
+    for name, build in (('from scratch', from_scratch),
+                        ('prebuilt', from_prebuilt)):
+        built = timed(build, repeat=args.repeat) * 1000
+        compiled = timed(
+            lambda: compile_sql(build()), repeat=args.repeat
+        ) * 1000
+        print(f'{name}: build {built:.1f} us, '
+              f'build + compile {compiled:.1f} us')
+
+    with bench_database():
+        seed(posts=args.posts)
+        Post.objects.update(text='слово ' * args.text_words)
+        for name, build in (('full text', from_scratch),
+                            ('card fields', from_prebuilt)):
+            elapsed = timed(lambda: list(build()[:10]))
+            print(f'{name}: first page {elapsed:.2f} ms')
+
+
+if __name__ == '__main__':
+    main()
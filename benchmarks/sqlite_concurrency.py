@@ -0,0 +1,108 @@
+"""Смешанная нагрузка: читатели ленты и авторы комментариев в потоках.
+
+Сравнивает SQLite с настройками по умолчанию и с SQLITE_PRAGMAS:
+
+    python benchmarks/sqlite_concurrency.py --readers 8 --writers 4
+"""
+import argparse
+import logging
+import statistics
+import tempfile
+import threading
+import time
+from pathlib import Path
+
+from common import User, bench_database, seed
+
+from django.conf import settings
+from django.db import connections
+from django.test import Client, override_settings
+
+from blog.models import Post
+
+DEFAULT_PRAGMAS = {
+    'journal_mode': 'delete',
+    'synchronous': 'full',
+    'busy_timeout': 5000,
+}
+
+
+def worker(make_request, seconds, latencies, errors):
+    deadline = time.perf_counter() + seconds
+    try:
+        while time.perf_counter() < deadline:
+            start = time.perf_counter()
+            try:
+                status = make_request()
+            except Exception:
+                status = 500
+            if status >= 400:
+                errors.append(status)
+            latencies.append((time.perf_counter() - start) * 1000)
+    finally:
+        connections.close_all()
+
+
+def run(pragmas, args):
+    with override_settings(SQLITE_PRAGMAS=pragmas), \
+            tempfile.TemporaryDirectory() as tmp, \
+            bench_database(str(Path(tmp) / 'bench.sqlite3')):
+        seed(posts=args.posts)
+        post_id = Post.objects.published().values_list(
+            'pk', flat=True
+        ).first()
+        users = list(User.objects.all()[:args.writers])
+        connections.close_all()
+
+        reads, writes, errors = [], [], []
+        threads = []
+        for _ in range(args.readers):
+            client = Client()
+            threads.append(threading.Thread(target=worker, args=(
+                lambda client=client: client.get('/').status_code,
+                args.seconds, reads, errors,
+            )))
+        for user in users:
+            client = Client()
+            client.force_login(user)
+            threads.append(threading.Thread(target=worker, args=(
+                lambda client=client: client.post(
+                    f'/posts/{post_id}/comment/', {'text': 'Комментарий'}
+                ).status_code,
+                args.seconds, writes, errors,
+            )))
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        return reads, writes, errors
+
+
+def describe(name, latencies, seconds):
+    if not latencies:
+        return f'  {name}: нет запросов'
+    p95 = statistics.quantiles(latencies, n=20)[-1]
+    return (f'  {name}: {len(latencies) / seconds:.1f} req/s, '
+            f'p50 {statistics.median(latencies):.1f} ms, p95 {p95:.1f} ms')
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--posts', type=int, default=5000)
+    parser.add_argument('--readers', type=int, default=8)
+    parser.add_argument('--writers', type=int, default=4)
+    parser.add_argument('--seconds', type=float, default=10)
+    args = parser.parse_args()
+    logging.getLogger('django.request').setLevel(logging.CRITICAL)
+    for name, pragmas in (
+        ('rollback journal', DEFAULT_PRAGMAS),
+        ('SQLITE_PRAGMAS', settings.SQLITE_PRAGMAS),
+    ):
+        reads, writes, errors = run(pragmas, args)
+        print(f'{name}: ошибок {len(errors)}')
+        print(describe('чтение ленты', reads, args.seconds))
+        print(describe('комментарии', writes, args.seconds))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,73 @@
+"""Первый и повторный рендеринг ленты с кешируемым загрузчиком.
+
+«Холодный» запрос идёт в свежем движке шаблонов, как первый запрос
+нового воркера; «прогретый» — после warm_templates(). Для сравнения
+показан загрузчик без кеша, как в настройках разработки.
+
+    python benchmarks/template_warmup.py --posts 10
+"""
+import argparse
+
+from common import bench_database, seed, timed
+
+from django.conf import settings
+from django.contrib.auth.models import AnonymousUser
+from django.core.cache import caches
+from django.template.backends.django import DjangoTemplates
+from django.test import RequestFactory
+
+from blog.models import Post
+from blogicum.template_warmup import warm_templates
+
+CACHED_LOADERS = [
+    ('django.template.loaders.cached.Loader', [
+        'django.template.loaders.filesystem.Loader',
+        'django.template.loaders.app_directories.Loader',
+    ]),
+]
+
+
+def make_engine(cached):
+    params = settings.TEMPLATES[0]
+    options = {**params['OPTIONS'], 'debug': False}
+    if cached:
+        options['loaders'] = CACHED_LOADERS
+    return DjangoTemplates({
+        'NAME': 'bench',
+        'DIRS': params['DIRS'],
+        'APP_DIRS': not cached,
+        'OPTIONS': options,
+    })
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--posts', type=int, default=10)
+    parser.add_argument('--repeat', type=int, default=20)
+    args = parser.parse_args()
+
+    request = RequestFactory().get('/')
+    request.user = AnonymousUser()
+    with bench_database():
+        seed(posts=args.posts)
+        context = {'page_obj': list(Post.objects.for_cards()[:args.posts])}
+        fragments = caches['template_fragments']
+
+        def render(engine):
+            fragments.clear()
+            engine.get_template('blog/index.html').render(context, request)
+
+        cold = timed(lambda: render(make_engine(cached=True)), args.repeat)
+        print(f'cached loader, cold: {cold:.2f} ms')
+        engine = make_engine(cached=True)
+        names = warm_templates(engine)
+        warm = timed(lambda: render(engine), args.repeat)
+        print(f'cached loader, warm ({len(names)} templates): '
+              f'{warm:.2f} ms')
+        engine = make_engine(cached=False)
+        uncached = timed(lambda: render(engine), args.repeat)
+        print(f'no cached loader: {uncached:.2f} ms')
+
+
+if __name__ == '__main__':
+    main()
@@ -1,12 +1,18 @@
 from django.contrib import admin
 
 from blog.models import Category, Comment, Location, Post
+from blog.search import search_posts
 
 
 @admin.register(Post)
 class PostAdmin(admin.ModelAdmin):
     search_fields = ['title']
 
+    def get_search_results(self, request, queryset, search_term):
+        if not search_term:
+            return queryset, False
+        return search_posts(queryset, search_term), False
+
 
 @admin.register(Category)
 class CategoryAdmin(admin.ModelAdmin):
@@ -0,0 +1,196 @@
+"""JSON API только для чтения: ``/api/v1/``.
+
+Публикации отбираются теми же правилами видимости, что и в HTML-ленте
+(``PostQuerySet.published()``, ``published_in()``, ``for_viewer()``), и
+листаются курсором CursorPaginator. Ответ собирается из словарей
+``values()`` без создания моделей; ``?fields=id,title`` оставляет в
+SELECT только столбцы запрошенных полей, как ``only()``.
+"""
+from django.core.exceptions import BadRequest
+from django.core.files.storage import default_storage
+from django.http import Http404, JsonResponse
+from django.views import View
+
+from blog.caching import get_published_category
+from blog.models import Comment, Post
+from blog.paginators import CursorPaginator, InvalidCursor
+
+DEFAULT_PAGE_SIZE = 20
+MAX_PAGE_SIZE = 100
+
+
+class Field:
+    """Поле ответа: пути для values() и, если нужно, преобразование."""
+
+    def __init__(self, *paths, convert=None):
+        self.paths = paths
+        self.convert = convert
+
+    def __call__(self, row):
+        if self.convert is None:
+            return row[self.paths[0]]
+        return self.convert(*(row[path] for path in self.paths))
+
+
+def location_name(name, is_published):
+    return name if is_published else None
+
+
+def image_url(name):
+    return default_storage.url(name) if name else None
+
+
+POST_FIELDS = {
+    'id': Field('id'),
+    'title': Field('title'),
+    'text': Field('text'),
+    'pub_date': Field('pub_date'),
+    'author': Field('author__username'),
+    'category': Field('category__slug'),
+    'location': Field(
+        'location__name', 'location__is_published', convert=location_name
+    ),
+    'image': Field('image', convert=image_url),
+    'comment_count': Field('comment_count'),
+}
+COMMENT_FIELDS = {
+    'id': Field('id'),
+    'text': Field('text'),
+    'created_at': Field('created_at'),
+    'author': Field('author__username'),
+}
+
+
+def json_response(data, status=200):
+    # Кириллица без \uXXXX: ответ заметно короче.
+    return JsonResponse(
+        data, status=status, json_dumps_params={'ensure_ascii': False}
+    )
+
+
+def serialize(rows, fields):
+    """Словари ответа из строк values() для выбранных полей."""
+    items = list(fields.items())
+    return [{name: field(row) for name, field in items} for row in rows]
+
+
+class ApiView(View):
+    """Общая часть: разбор ?fields= и ошибки в виде JSON."""
+
+    http_method_names = ['get', 'head', 'options']
+    fields = POST_FIELDS
+    # Выборки через for_viewer() читают из основной базы: автор должен
+    # видеть только что созданный отложенный пост, даже если реплика
+    # отстаёт дольше REPLICA_PIN_SECONDS.
+    read_replica = True
+
+    def dispatch(self, request, *args, **kwargs):
+        try:
+            return super().dispatch(request, *args, **kwargs)
+        except Http404 as error:
+            return json_response(
+                {'detail': str(error) or 'Не найдено.'}, status=404
+            )
+        except (BadRequest, InvalidCursor) as error:
+            return json_response({'detail': str(error)}, status=400)
+
+    def get_fields(self):
+        names = [
+            name.strip()
+            for name in self.request.GET.get('fields', '').split(',')
+            if name.strip()
+        ]
+        unknown = [name for name in names if name not in self.fields]
+        if unknown:
+            raise BadRequest(f'Неизвестные поля: {", ".join(unknown)}.')
+        return {name: self.fields[name] for name in names or self.fields}
+
+    def get_paths(self, fields, *required):
+        return list(dict.fromkeys(
+            (*required, *(path for f in fields.values() for path in f.paths))
+        ))
+
+
+class ApiListView(ApiView):
+    """Страница объектов по курсору: ?after=, ?before=, ?page_size=."""
+
+    ordering = ('pub_date', 'id')
+    descending = True
+
+    def get_page_size(self):
+        try:
+            size = int(self.request.GET.get('page_size', DEFAULT_PAGE_SIZE))
+        except ValueError:
+            raise BadRequest('page_size должен быть числом.')
+        return min(max(size, 1), MAX_PAGE_SIZE)
+
+    def page_url(self, name, cursor):
+        if cursor is None:
+            return None
+        query = self.request.GET.copy()
+        query.pop('after', None)
+        query.pop('before', None)
+        query[name] = cursor
+        return f'{self.request.path}?{query.urlencode()}'
+
+    def get(self, request, *args, **kwargs):
+        fields = self.get_fields()
+        paginator = CursorPaginator(
+            self.get_queryset().values(
+                *self.get_paths(fields, *self.ordering)
+            ),
+            self.get_page_size(),
+            ordering=self.ordering,
+            descending=self.descending,
+        )
+        page = paginator.page(
+            after=request.GET.get('after'), before=request.GET.get('before')
+        )
+        return json_response({
+            'results': serialize(page, fields),
+            'next': self.page_url('after', page.next_cursor),
+            'previous': self.page_url('before', page.previous_cursor),
+        })
+
+
+class PostListApiView(ApiListView):
+
+    def get_queryset(self):
+        return Post.objects.published()
+
+
+class CategoryPostListApiView(ApiListView):
+
+    def get_queryset(self):
+        category = get_published_category(self.kwargs['category_slug'])
+        if category is None:
+            raise Http404('Категория не найдена.')
+        return Post.objects.published_in(category)
+
+
+class CommentListApiView(ApiListView):
+    fields = COMMENT_FIELDS
+    read_replica = False
+    ordering = ('created_at', 'id')
+    descending = False
+
+    def get_queryset(self):
+        post_id = self.kwargs['post_id']
+        if not Post.objects.for_viewer(self.request.user).filter(
+                pk=post_id
+        ).exists():
+            raise Http404('Публикация не найдена.')
+        return Comment.objects.filter(post_id=post_id)
+
+
+class PostDetailApiView(ApiView):
+    read_replica = False
+
+    def get(self, request, post_id):
+        fields = self.get_fields()
+        row = Post.objects.for_viewer(request.user).filter(
+            pk=post_id
+        ).values(*self.get_paths(fields)).first()
+        if row is None:
+            raise Http404('Публикация не найдена.')
+        return json_response(serialize([row], fields)[0])
@@ -1,6 +1,14 @@
 from django.apps import AppConfig
+from django.conf import settings
 
 
 class BlogConfig(AppConfig):
     name = 'blog'
     verbose_name = 'Блог'
+
+    def ready(self):
+        from blog import signals  # noqa: F401
+
+        if settings.TEMPLATE_WARMUP:
+            from blogicum.template_warmup import warm_templates
+            warm_templates()
@@ -0,0 +1,65 @@
+import time
+
+from django.conf import settings
+from django.core.cache import DEFAULT_CACHE_ALIAS, cache, caches
+from django.core.cache.backends.locmem import LocMemCache
+
+from blog.models import Category
+
+FEED_VERSION_KEY = 'blog:feed-version'
+
+# slug -> (момент устаревания, опубликованная категория) в этом процессе.
+_published_categories = {}
+
+
+def get_feed_version():
+    """Номер поколения ленты: меняется, когда меняется состав публикаций."""
+    version = cache.get(FEED_VERSION_KEY)
+    if version is None:
+        cache.add(FEED_VERSION_KEY, 1, timeout=None)
+        version = cache.get(FEED_VERSION_KEY, 1)
+    return version
+
+
+def bump_feed_version():
+    try:
+        cache.incr(FEED_VERSION_KEY)
+    except ValueError:
+        cache.set(FEED_VERSION_KEY, 2, timeout=None)
+
+
+def process_local_caches():
+    """Кеши версии ленты и страниц, которые живут в памяти процесса.
+
+    Сброс в таком кеше из отдельного процесса (воркера) не увидят
+    веб-процессы.
+    """
+    return [
+        alias for alias in (DEFAULT_CACHE_ALIAS, settings.PAGE_CACHE)
+        if isinstance(caches[alias], LocMemCache)
+    ]
+
+
+def get_published_category(slug):
+    """Опубликованная категория по slug или None.
+
+    Найденные категории хранятся в памяти процесса
+    ``CATEGORY_CACHE_TIMEOUT`` секунд. Сохранение или удаление любой
+    категории очищает кеш сразу, остальные процессы узнают об этом
+    по истечении срока.
+    """
+    now = time.monotonic()
+    cached = _published_categories.get(slug)
+    if cached is not None and cached[0] > now:
+        return cached[1]
+    category = Category.objects.filter(slug=slug, is_published=True).first()
+    if category is not None:
+        # Промахи не запоминаются, чтобы случайные slug не копились.
+        _published_categories[slug] = (
+            now + settings.CATEGORY_CACHE_TIMEOUT, category
+        )
+    return category
+
+
+def clear_category_cache():
+    _published_categories.clear()
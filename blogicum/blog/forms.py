@@ -5,6 +5,19 @@ from blog.models import Comment, Post
 
 class PostForm(forms.ModelForm):
 
+    def __init__(self, *args, upload_errors=None, **kwargs):
+        super().__init__(*args, **kwargs)
+        # Файлы, отброшенные ImageUploadHandler ещё при приёме: вместо
+        # «Обязательное поле» форма покажет причину.
+        self.upload_errors = upload_errors or {}
+        for name in self.upload_errors:
+            self.fields[name].required = False
+
+    def clean(self):
+        for name, message in self.upload_errors.items():
+            self.add_error(name, message)
+        return super().clean()
+
     class Meta:
         model = Post
         fields = (
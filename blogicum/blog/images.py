@@ -0,0 +1,228 @@
+"""Уменьшенные копии картинок публикаций.
+
+Для каждой загруженной картинки строятся копии в WebP и JPEG нужной
+ширины. Они лежат рядом с оригиналом: ``image/2026/01/31/photo.jpg``
+даёт ``photo_640w.webp``, ``photo_640w.jpg`` и т. д. Какие ширины уже
+готовы, хранит поле ``Post.image_renditions``. Копии строит команда
+``generate_renditions`` вне запроса; с ``--interval`` она работает
+фоном и подхватывает новые загрузки, а до этого карточка показывает
+оригинал. Кодирование идёт в пуле процессов, чтобы не упираться в GIL
+и одно ядро. В хранилище по содержимому готовые копии одинаковых
+картинок не кодируются заново.
+"""
+import hashlib
+import os
+from concurrent.futures import ProcessPoolExecutor
+from io import BytesIO
+
+from django.conf import settings
+from django.core.files.base import ContentFile
+from django.dispatch import Signal
+from django.utils import timezone
+from PIL import Image, ImageOps
+
+from blog.storage import is_blob_name
+
+FORMATS = {
+    'webp': ('WEBP', 'webp'),
+    'jpeg': ('JPEG', 'jpg'),
+}
+# Значения тега Orientation, при которых картинка повёрнута на 90°.
+EXIF_ORIENTATION = 0x0112
+ROTATED = (5, 6, 7, 8)
+# Карточка шириной 40rem: браузер выберет копию под экран и плотность.
+CARD_SIZES = '(max-width: 40rem) 100vw, 40rem'
+
+# Отправляется с аргументом instance, когда копии картинки поста готовы.
+renditions_ready = Signal()
+
+_executor = None
+
+
+def get_executor():
+    """Общий пул процессов; создаётся при первом обращении."""
+    global _executor
+    if _executor is None:
+        _executor = ProcessPoolExecutor(
+            max_workers=settings.POST_IMAGE_WORKERS
+        )
+    return _executor
+
+
+def rendition_name(name, width, fmt):
+    root, _ = os.path.splitext(name)
+    return f'{root}_{width}w.{FORMATS[fmt][1]}'
+
+
+def target_widths(data):
+    """Ширины копий без увеличения: узкая картинка получает одну копию."""
+    with Image.open(BytesIO(data)) as image:
+        width = ImageOps.exif_transpose(image).width
+    return [
+        target for target in settings.POST_IMAGE_WIDTHS if target < width
+    ] or [width]
+
+
+def render(data, width, fmt):
+    """Кодирует одну копию; выполняется в процессе пула."""
+    with Image.open(BytesIO(data)) as image:
+        image = ImageOps.exif_transpose(image)
+        if image.width > width:
+            height = round(image.height * width / image.width)
+            image = image.resize((width, height), Image.LANCZOS)
+        if fmt == 'jpeg' and image.mode not in ('RGB', 'L'):
+            image = image.convert('RGB')
+        output = BytesIO()
+        image.save(
+            output, FORMATS[fmt][0], quality=settings.POST_IMAGE_QUALITY
+        )
+        return output.getvalue()
+
+
+def describe(file):
+    """Размеры с учётом поворота по EXIF, объём и SHA-256 файла.
+
+    Пиксели не декодируются: Pillow читает только заголовок.
+    """
+    digest = hashlib.sha256()
+    size = 0
+    with file.open('rb'):
+        for chunk in file.chunks():
+            digest.update(chunk)
+            size += len(chunk)
+        file.seek(0)
+        with Image.open(file) as image:
+            width, height = image.size
+            if image.getexif().get(EXIF_ORIENTATION) in ROTATED:
+                width, height = height, width
+    return {
+        'name': file.name,
+        'width': width,
+        'height': height,
+        'size': size,
+        'sha256': digest.hexdigest(),
+    }
+
+
+def make_renditions(files, executor=None):
+    """Строит и сохраняет копии для нескольких файлов сразу.
+
+    Задачи всех файлов отправляются в пул вместе. Для каждого файла
+    возвращается словарь ``{формат: [ширины]}`` или исключение, если
+    картинку не удалось прочитать или закодировать.
+    """
+    executor = executor or get_executor()
+    jobs = []
+    for file in files:
+        try:
+            with file.open('rb'):
+                data = file.read()
+            tasks = {
+                (width, fmt): (
+                    None if is_shared(file, width, fmt)
+                    else executor.submit(render, data, width, fmt)
+                )
+                for width in target_widths(data)
+                for fmt in FORMATS
+            }
+        except Exception as error:
+            tasks = error
+        jobs.append((file, tasks))
+    return [save_renditions(file, tasks) for file, tasks in jobs]
+
+
+def is_shared(file, width, fmt):
+    """Копия уже есть у такого же файла в хранилище по содержимому."""
+    return (
+        getattr(file.storage, 'content_addressed', False)
+        and is_blob_name(file.name)
+        and file.storage.exists(rendition_name(file.name, width, fmt))
+    )
+
+
+def save_file(storage, name, content):
+    """Сохраняет копию под её именем: по нему строится srcset."""
+    if hasattr(storage, 'save_derived'):
+        storage.save_derived(name, ContentFile(content))
+        return
+    storage.delete(name)
+    saved = storage.save(name, ContentFile(content))
+    if saved != name:
+        raise OSError(f'Копия сохранена как {saved} вместо {name}.')
+
+
+def save_renditions(file, tasks):
+    if isinstance(tasks, Exception):
+        return tasks
+    renditions = {}
+    try:
+        for (width, fmt), task in tasks.items():
+            if task is None:
+                renditions.setdefault(fmt, []).append(width)
+                continue
+            content = task.result()
+            save_file(
+                file.storage, rendition_name(file.name, width, fmt), content
+            )
+            renditions.setdefault(fmt, []).append(width)
+    except Exception as error:
+        return error
+    return renditions
+
+
+def refresh_renditions(posts, executor=None):
+    """Строит копии картинок постов и записывает, какие готовы.
+
+    Пост с ошибкой остаётся без копий, и его можно обработать снова.
+    Возвращает результаты make_renditions() в порядке постов.
+    """
+    results = make_renditions([post.image for post in posts], executor)
+    for post, renditions in zip(posts, results):
+        if isinstance(renditions, Exception):
+            continue
+        post.image_renditions = renditions
+        # updated_at входит в ключ кеша карточки.
+        post.updated_at = timezone.now()
+        type(post).objects.filter(pk=post.pk).update(
+            image_renditions=renditions, updated_at=post.updated_at
+        )
+        renditions_ready.send(sender=type(post), instance=post)
+    return results
+
+
+class Renditions:
+    """Адреса копий картинки для атрибутов src и srcset."""
+
+    sizes = CARD_SIZES
+
+    def __init__(self, file, renditions):
+        self.file = file
+        self.renditions = renditions or {}
+
+    def __bool__(self):
+        return bool(self.renditions)
+
+    def srcset(self, fmt):
+        return ', '.join(
+            f'{self.file.storage.url(rendition_name(self.file.name, w, fmt))}'
+            f' {w}w'
+            for w in sorted(self.renditions.get(fmt, ()))
+        )
+
+    @property
+    def webp_srcset(self):
+        return self.srcset('webp')
+
+    @property
+    def jpeg_srcset(self):
+        return self.srcset('jpeg')
+
+    @property
+    def src(self):
+        """Самая широкая JPEG-копия для браузеров без srcset."""
+        widths = self.renditions.get('jpeg')
+        if not widths:
+            return self.file.url
+        return self.file.storage.url(
+            rendition_name(self.file.name, max(widths), 'jpeg')
+        )
@@ -0,0 +1,108 @@
+import os
+import time
+from functools import reduce
+from itertools import islice
+from operator import or_
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.db.models import Q
+
+from blog.models import MediaBlob, Post
+from blog.storage import BLOB_DIR, digest_from_name
+
+
+def walk_files(root):
+    """Файлы под root по одному; в памяти только стек каталогов."""
+    stack = [root]
+    while stack:
+        with os.scandir(stack.pop()) as entries:
+            for entry in entries:
+                if entry.is_dir(follow_symlinks=False):
+                    stack.append(entry.path)
+                elif entry.is_file(follow_symlinks=False):
+                    yield entry
+
+
+def live_digests(digests):
+    """Хеши файлов, на которые ещё ссылаются публикации."""
+    live = set(
+        MediaBlob.objects.filter(sha256__in=digests, refcount__gt=0)
+        .values_list('sha256', flat=True)
+    )
+    rest = digests - live
+    if rest:
+        # Счётчик мог разойтись с данными, например после loaddata.
+        prefixes = [f'{BLOB_DIR}/{d[:2]}/{d[2:4]}/{d}' for d in rest]
+        live.update(
+            digest_from_name(name) for name in Post.objects.filter(
+                reduce(or_, (Q(image__startswith=p) for p in prefixes))
+            ).values_list('image', flat=True)
+        )
+    return live
+
+
+class Command(BaseCommand):
+    help = (
+        'Удаляет файлы хранилища по содержимому, на которые не ссылается '
+        'ни одна публикация, вместе с их копиями.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=500,
+            help='Сколько файлов проверять одним запросом к базе.',
+        )
+        parser.add_argument(
+            '--grace',
+            type=int,
+            default=settings.MEDIA_GC_GRACE,
+            help='Не трогать файлы моложе стольких секунд.',
+        )
+        parser.add_argument(
+            '--dry-run',
+            action='store_true',
+            help='Только показать, что будет удалено.',
+        )
+
+    def handle(self, *args, batch_size, grace, dry_run, **options):
+        root = os.path.join(settings.MEDIA_ROOT, BLOB_DIR)
+        if not os.path.isdir(root):
+            self.stdout.write('Хранилище пусто.')
+            return
+        deadline = time.time() - grace
+        files = walk_files(root)
+        kept = removed = freed = 0
+        while batch := list(islice(files, batch_size)):
+            live = live_digests(
+                {digest_from_name(entry.name) for entry in batch} - {None}
+            )
+            released = set()
+            for entry in batch:
+                digest = digest_from_name(entry.name)
+                stat = entry.stat(follow_symlinks=False)
+                # Временные файлы оборванных загрузок без хеша в имени
+                # тоже удаляются, когда станут старше grace.
+                if digest in live or stat.st_mtime > deadline:
+                    kept += 1
+                    continue
+                self.stdout.write(os.path.relpath(entry.path, root))
+                if not dry_run:
+                    try:
+                        os.remove(entry.path)
+                    except FileNotFoundError:
+                        continue
+                if digest:
+                    released.add(digest)
+                removed += 1
+                freed += stat.st_size
+            if not dry_run and released:
+                # Условие на счётчик: ссылка могла появиться за это время.
+                MediaBlob.objects.filter(
+                    sha256__in=released, refcount=0
+                ).delete()
+        self.stdout.write(self.style.SUCCESS(
+            f'Удалено файлов: {removed} ({freed} байт), оставлено: {kept}.'
+        ))
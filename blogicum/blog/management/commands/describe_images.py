@@ -0,0 +1,69 @@
+from concurrent.futures import ThreadPoolExecutor
+
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+from blog.images import describe
+from blog.models import Post, PostImage
+
+
+def safe_describe(file):
+    try:
+        return describe(file)
+    except Exception as error:
+        return error
+
+
+class Command(BaseCommand):
+    help = (
+        'Записывает размеры, объём и хеш картинок публикаций, у которых '
+        'их ещё нет. Прерванный запуск можно повторить.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=100,
+            help='Сколько картинок читать параллельно за один проход.',
+        )
+        parser.add_argument(
+            '--workers',
+            type=int,
+            default=8,
+            help='Число потоков чтения файлов.',
+        )
+
+    def handle(self, *args, batch_size, workers, **options):
+        # Чтение файлов и SHA-256 отпускают GIL, поэтому хватает потоков.
+        posts = Post.objects.exclude(image='').exclude(
+            image__isnull=True
+        ).filter(image_meta__isnull=True).only('image').order_by('pk')
+        last_id = 0
+        done = failed = 0
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            while True:
+                batch = list(posts.filter(pk__gt=last_id)[:batch_size])
+                if not batch:
+                    break
+                last_id = batch[-1].pk
+                results = executor.map(
+                    safe_describe, [post.image for post in batch]
+                )
+                for post, info in zip(batch, results):
+                    if isinstance(info, Exception):
+                        failed += 1
+                        self.stderr.write(f'Публикация {post.pk}: {info!r}')
+                        continue
+                    PostImage.objects.update_or_create(
+                        post=post, defaults=info
+                    )
+                    # updated_at входит в ключ кеша карточки.
+                    Post.objects.filter(pk=post.pk).update(
+                        updated_at=timezone.now()
+                    )
+                    done += 1
+                self.stdout.write(f'Обработано до публикации {last_id}')
+        self.stdout.write(self.style.SUCCESS(
+            f'Описано картинок: {done}, с ошибками: {failed}.'
+        ))
@@ -0,0 +1,88 @@
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from django.core.management.base import BaseCommand
+from django.db import close_old_connections
+
+from blog.images import refresh_renditions
+from blog.models import Post
+
+
+class Command(BaseCommand):
+    help = (
+        'Строит уменьшенные копии картинок публикаций. Посты с готовыми '
+        'копиями пропускаются, поэтому прерванный запуск можно повторить. '
+        'С --interval команда работает фоном и подхватывает новые загрузки.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=20,
+            help='Сколько картинок кодировать параллельно за один проход.',
+        )
+        parser.add_argument(
+            '--workers',
+            type=int,
+            default=None,
+            help='Число процессов; по умолчанию по числу ядер.',
+        )
+        parser.add_argument(
+            '--force',
+            action='store_true',
+            help='Пересоздать копии и у обработанных постов.',
+        )
+        parser.add_argument(
+            '--interval',
+            type=float,
+            default=None,
+            help=(
+                'Не выходить, а повторять проход каждые N секунд. '
+                'Картинки с ошибками повторно не обрабатываются.'
+            ),
+        )
+
+    def handle(self, *args, batch_size, workers, force, interval,
+               **options):
+        posts = Post.objects.exclude(image='').exclude(image__isnull=True)
+        if not force:
+            posts = posts.filter(image_renditions={})
+        posts = posts.only(
+            'image', 'image_renditions', 'category_id', 'author_id'
+        ).order_by('pk')
+        failed_ids = set()
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            while True:
+                close_old_connections()
+                done, failed = self.process(
+                    posts.exclude(pk__in=failed_ids), batch_size, executor
+                )
+                failed_ids.update(failed)
+                if interval is None or done or failed:
+                    self.stdout.write(self.style.SUCCESS(
+                        f'Готово картинок: {done}, '
+                        f'с ошибками: {len(failed)}.'
+                    ))
+                if interval is None:
+                    break
+                # Повторный --force пересоздал бы всё заново.
+                posts = posts.filter(image_renditions={})
+                time.sleep(interval)
+
+    def process(self, posts, batch_size, executor):
+        last_id = 0
+        done, failed = 0, []
+        while True:
+            batch = list(posts.filter(pk__gt=last_id)[:batch_size])
+            if not batch:
+                return done, failed
+            last_id = batch[-1].pk
+            results = refresh_renditions(batch, executor)
+            for post, result in zip(batch, results):
+                if isinstance(result, Exception):
+                    failed.append(post.pk)
+                    self.stderr.write(f'Публикация {post.pk}: {result!r}')
+                else:
+                    done += 1
+            self.stdout.write(f'Обработано до публикации {last_id}')
@@ -0,0 +1,25 @@
+from django.core.management.base import BaseCommand
+
+from blog import page_cache
+
+
+class Command(BaseCommand):
+    help = 'Показывает попадания и промахи кеша страниц ленты.'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--reset',
+            action='store_true',
+            help='Обнулить счётчики после вывода.',
+        )
+
+    def handle(self, *args, reset, **options):
+        stats = page_cache.get_stats()
+        total = sum(stats.values())
+        ratio = stats['hits'] / total if total else 0
+        self.stdout.write(
+            f'Попаданий: {stats["hits"]}, промахов: {stats["misses"]}, '
+            f'доля попаданий: {ratio:.1%}'
+        )
+        if reset:
+            page_cache.reset_stats()
@@ -0,0 +1,65 @@
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import close_old_connections
+from django.utils import timezone
+
+from blog.caching import process_local_caches
+from blog.scheduling import next_publication_time, publish_due
+
+
+class Command(BaseCommand):
+    help = (
+        'Публикует отложенные посты в момент наступления их pub_date. '
+        'Версию ленты и кеш страниц команда сбрасывает из своего процесса, '
+        'поэтому им нужно общее с веб-процессами хранилище '
+        '(BLOGICUM_CACHE и BLOGICUM_PAGE_CACHE).'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--once',
+            action='store_true',
+            help='Обработать наступившие публикации и выйти.',
+        )
+        parser.add_argument(
+            '--max-sleep',
+            type=float,
+            default=60,
+            help=(
+                'Не спать дольше N секунд, чтобы заметить посты, '
+                'запланированные другими процессами.'
+            ),
+        )
+        parser.add_argument(
+            '--allow-local-cache',
+            action='store_true',
+            help=(
+                'Запускаться и с кешем в памяти процесса, например когда '
+                'сайт работает в одном процессе.'
+            ),
+        )
+
+    def handle(self, *args, once, max_sleep, allow_local_cache, **options):
+        local = process_local_caches()
+        if local and not allow_local_cache:
+            raise CommandError(
+                f'Кеши {", ".join(local)} хранятся в памяти процесса: '
+                'веб-процессы не узнают о публикации. Задайте общий кеш '
+                'через BLOGICUM_CACHE и BLOGICUM_PAGE_CACHE или '
+                'запустите с --allow-local-cache.'
+            )
+        while True:
+            close_old_connections()
+            for post in publish_due():
+                self.stdout.write(f'Опубликовано: {post.pk} {post}')
+            if once:
+                break
+            time.sleep(self.get_delay(max_sleep))
+
+    def get_delay(self, max_sleep):
+        publish_at = next_publication_time()
+        if publish_at is None:
+            return max_sleep
+        delay = (publish_at - timezone.now()).total_seconds()
+        return min(max(delay, 0), max_sleep)
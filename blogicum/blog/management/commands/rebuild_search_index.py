@@ -0,0 +1,23 @@
+from django.core.management.base import BaseCommand, CommandError
+from django.db import DEFAULT_DB_ALIAS, connections
+
+from blog import search
+
+
+class Command(BaseCommand):
+    help = 'Перестраивает полнотекстовый индекс публикаций.'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--database',
+            default=DEFAULT_DB_ALIAS,
+            help='База данных, в которой перестроить индекс.',
+        )
+
+    def handle(self, *args, database, **options):
+        connection = connections[database]
+        if not search.is_supported(connection):
+            raise CommandError('Полнотекстовый индекс есть только в SQLite.')
+        if not search.install(connection):
+            search.rebuild(connection)
+        self.stdout.write(self.style.SUCCESS('Индекс перестроен.'))
@@ -0,0 +1,59 @@
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.db.models import Count
+
+from blog.models import Comment, Post
+
+
+class Command(BaseCommand):
+    help = 'Пересчитывает сохранённое число комментариев у публикаций.'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=1000,
+            help='Сколько публикаций проверять за один проход.',
+        )
+        parser.add_argument(
+            '--dry-run',
+            action='store_true',
+            help='Только показать расхождения, ничего не исправляя.',
+        )
+
+    def handle(self, *args, batch_size, dry_run, **options):
+        last_id = 0
+        checked = repaired = 0
+        while True:
+            batch = list(
+                Post.objects.filter(pk__gt=last_id)
+                .order_by('pk')
+                .values_list('pk', 'comment_count')[:batch_size]
+            )
+            if not batch:
+                break
+            last_id = batch[-1][0]
+            checked += len(batch)
+            with transaction.atomic():
+                actual = dict(
+                    Comment.objects.filter(
+                        post__in=[post_id for post_id, _ in batch]
+                    ).order_by().values('post_id').annotate(
+                        total=Count('id')
+                    ).values_list('post_id', 'total')
+                )
+                for post_id, stored in batch:
+                    total = actual.get(post_id, 0)
+                    if total == stored:
+                        continue
+                    repaired += 1
+                    self.stdout.write(
+                        f'Публикация {post_id}: {stored} -> {total}'
+                    )
+                    if not dry_run:
+                        Post.objects.filter(pk=post_id).update(
+                            comment_count=total
+                        )
+        self.stdout.write(self.style.SUCCESS(
+            f'Проверено публикаций: {checked}, расхождений: {repaired}.'
+        ))
@@ -0,0 +1,45 @@
+import sqlite3
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db import DEFAULT_DB_ALIAS
+
+
+class Command(BaseCommand):
+    help = 'Копирует основную SQLite-базу в файлы реплик.'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--interval',
+            type=float,
+            default=0,
+            help='Повторять копирование каждые N секунд.',
+        )
+
+    def handle(self, *args, interval, **options):
+        if not settings.DATABASE_REPLICAS:
+            raise CommandError(
+                'Реплики не настроены: задайте BLOGICUM_DB_REPLICAS.'
+            )
+        while True:
+            self.sync()
+            if not interval:
+                break
+            time.sleep(interval)
+
+    def sync(self):
+        primary = settings.DATABASES[DEFAULT_DB_ALIAS]['NAME']
+        source = sqlite3.connect(primary)
+        try:
+            for alias in settings.DATABASE_REPLICAS:
+                target = sqlite3.connect(settings.DATABASES[alias]['NAME'])
+                try:
+                    # Backup API даёт согласованный снимок даже во время
+                    # записи в основную базу.
+                    source.backup(target)
+                finally:
+                    target.close()
+                self.stdout.write(f'{alias}: синхронизирована')
+        finally:
+            source.close()
@@ -0,0 +1,28 @@
+from django.core.management.base import BaseCommand
+from django.template import engines
+from django.template.backends.django import DjangoTemplates
+
+from blogicum.template_warmup import uses_cached_loader, warm_templates
+
+
+class Command(BaseCommand):
+    help = (
+        'Разбирает шаблоны проекта и проверяет их синтаксис. Кеш разбора '
+        'живёт в процессе: воркеры прогревают его сами при '
+        'TEMPLATE_WARMUP = True.'
+    )
+
+    def handle(self, *args, **options):
+        if not any(
+                isinstance(engine, DjangoTemplates)
+                and uses_cached_loader(engine)
+                for engine in engines.all()
+        ):
+            self.stdout.write(self.style.WARNING(
+                'Кешируемый загрузчик шаблонов не включён: шаблоны будут '
+                'перечитываться на каждый запрос.'
+            ))
+        names = warm_templates()
+        self.stdout.write(self.style.SUCCESS(
+            f'Разобрано шаблонов: {len(names)}.'
+        ))
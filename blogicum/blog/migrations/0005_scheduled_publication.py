@@ -0,0 +1,40 @@
+# Generated by Django 3.2.16 on 2026-10-18 04:47
+
+from django.db import migrations, models
+from django.utils import timezone
+import django.db.models.deletion
+
+
+def fill_schedule(apps, schema_editor):
+    Post = apps.get_model('blog', 'Post')
+    ScheduledPublication = apps.get_model('blog', 'ScheduledPublication')
+    ScheduledPublication.objects.bulk_create(
+        ScheduledPublication(post_id=post_id, publish_at=pub_date)
+        for post_id, pub_date in Post.objects.filter(
+            is_published=True, pub_date__gt=timezone.now()
+        ).values_list('pk', 'pub_date')
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('blog', '0004_post_search_index'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ScheduledPublication',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('publish_at', models.DateTimeField(db_index=True, verbose_name='Время публикации')),
+                ('post', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, related_name='schedule', to='blog.post', verbose_name='публикация')),
+            ],
+            options={
+                'verbose_name': 'отложенная публикация',
+                'verbose_name_plural': 'Отложенные публикации',
+                'ordering': ('publish_at',),
+            },
+        ),
+        migrations.RunPython(fill_schedule, migrations.RunPython.noop),
+    ]
@@ -1,36 +1,209 @@
-from django.db.models import Count
+import hashlib
+import time
+
+from django.conf import settings
+from django.http import Http404
 from django.shortcuts import redirect
 from django.urls import reverse
-from django.utils import timezone
+from django.utils.cache import get_conditional_response, quote_etag
+from django.utils.http import http_date
 
+from blog import page_cache
 from blog.models import Comment, Post
+from blog.paginators import (CachedCountPaginator, CursorPaginator,
+                             InvalidCursor)
 
 
 class PostsMixin:
     model = Post
+    # Выборка собирается один раз при импорте; на каждый запрос
+    # ListView берёт её копию через queryset.all().
+    queryset = Post.objects.for_cards().order_by('-pub_date', '-id')
     paginate_by = 10
     pk_url_kwarg = 'post_id'
+    cursor_pagination = True
+    cursor_ordering = ('pub_date', 'id')
+    cursor_descending = True
+    read_replica = True
+    paginator_class = CachedCountPaginator
+    page_range_on_each_side = 2
+    page_range_on_ends = 1
 
     def all_posts(self):
-        return self.model.objects.select_related(
-            'category', 'author', 'location'
-        ).order_by('-pub_date').annotate(comment_count=Count('comments'))
+        return super().get_queryset()
 
     def get_queryset(self):
-        return self.all_posts().filter(
-            is_published=True,
-            category__is_published=True,
-            pub_date__lte=timezone.now(),
+        return self.all_posts().published()
+
+    def get_page_range(self, page):
+        return list(page.paginator.get_elided_page_range(
+            page.number,
+            on_each_side=self.page_range_on_each_side,
+            on_ends=self.page_range_on_ends,
+        ))
+
+    def get_count_cache_key(self):
+        return self.request.path
+
+    def get_paginator(self, queryset, per_page, orphans=0,
+                      allow_empty_first_page=True, **kwargs):
+        return super().get_paginator(
+            queryset, per_page, orphans, allow_empty_first_page,
+            cache_key=self.get_count_cache_key(), **kwargs
+        )
+
+    def get_context_data(self, **kwargs):
+        context = super().get_context_data(**kwargs)
+        page = context.get('page_obj')
+        if page is not None and hasattr(page, 'number'):
+            context['page_range'] = self.get_page_range(page)
+        # Остальные параметры запроса (например, поисковый) сохраняются
+        # в ссылках пагинатора.
+        params = self.request.GET.copy()
+        for key in (self.page_kwarg, 'after', 'before'):
+            params.pop(key, None)
+        context['query_prefix'] = f'{params.urlencode()}&' if params else ''
+        return context
+
+    def paginate_queryset(self, queryset, page_size):
+        # Старые ссылки вида ?page=N обслуживаются обычным пагинатором.
+        if (
+                not self.cursor_pagination
+                or self.page_kwarg in self.request.GET
+        ):
+            return super().paginate_queryset(queryset, page_size)
+        paginator = CursorPaginator(
+            queryset,
+            page_size,
+            ordering=self.cursor_ordering,
+            descending=self.cursor_descending,
+        )
+        try:
+            page = paginator.page(
+                after=self.request.GET.get('after'),
+                before=self.request.GET.get('before'),
+            )
+        except InvalidCursor as error:
+            raise Http404(error)
+        return paginator, page, page.object_list, page.has_other_pages()
+
+
+class ConditionalGetMixin:
+    """Отвечает 304, если у клиента уже есть актуальная страница.
+
+    Валидаторы из get_etag() и get_last_modified() считаются до
+    основных запросов и рендеринга. Полный ответ строит
+    get_full_response().
+    """
+
+    def get_etag(self):
+        return None
+
+    def get_last_modified(self):
+        return None
+
+    def get_full_response(self, request, *args, **kwargs):
+        return super().dispatch(request, *args, **kwargs)
+
+    def dispatch(self, request, *args, **kwargs):
+        if request.method not in ('GET', 'HEAD'):
+            return super().dispatch(request, *args, **kwargs)
+        etag = self.get_etag()
+        if etag is not None:
+            etag = quote_etag(hashlib.md5(etag.encode()).hexdigest())
+        last_modified = self.get_last_modified()
+        if last_modified is not None:
+            last_modified = int(last_modified.timestamp())
+        response = get_conditional_response(
+            request, etag=etag, last_modified=last_modified
         )
+        if response is not None:
+            return response
+        response = self.get_full_response(request, *args, **kwargs)
+        if response.status_code == 200:
+            # Страница из кеша несёт валидаторы момента своего рендеринга.
+            if etag is not None:
+                response['ETag'] = etag
+            if last_modified is not None:
+                response['Last-Modified'] = http_date(last_modified)
+        return response
+
+
+class PageCacheMixin(ConditionalGetMixin):
+    """Отдаёт анонимным читателям готовую страницу из кеша.
+
+    Ключ страницы строится из пути, параметров ``page_cache_params`` и
+    версий тегов из get_page_cache_tags(). Заголовок ``X-Page-Cache``
+    показывает, попал ли запрос в кеш. Те же версии служат ETag.
+    """
+
+    page_cache_params = ('page', 'after', 'before')
+
+    def get_page_cache_tags(self):
+        return [page_cache.GLOBAL_TAG]
+
+    def get_etag(self):
+        versions = page_cache.get_tag_versions(self.get_page_cache_tags())
+        # Посты с наступившей pub_date без воркера публикаций появятся
+        # не позже, чем через PAGE_CACHE_TIMEOUT.
+        period = int(time.time() // settings.PAGE_CACHE_TIMEOUT)
+        return f'{versions}:{period}:{self.request.user.pk}'
+
+    def get_full_response(self, request, *args, **kwargs):
+        if request.user.is_authenticated:
+            return super().get_full_response(request, *args, **kwargs)
+        cache = page_cache.get_cache()
+        key = page_cache.page_key(
+            request, self.get_page_cache_tags(), self.page_cache_params
+        )
+        response = cache.get(key)
+        if response is not None:
+            page_cache.count('hits')
+            response['X-Page-Cache'] = 'hit'
+            return response
+        page_cache.count('misses')
+        response = super().get_full_response(request, *args, **kwargs)
+        if response.status_code == 200 and not response.cookies:
+            response['X-Page-Cache'] = 'miss'
+            response.add_post_render_callback(
+                lambda response: cache.set(
+                    key, response, settings.PAGE_CACHE_TIMEOUT
+                )
+            )
+        return response
+
+
+class CachedObjectMixin:
+    """Загружает объект один раз за запрос.
+
+    Проверка авторства в dispatch() и обработчики UpdateView/DeleteView
+    получают один и тот же экземпляр.
+    """
+
+    _object = None
+
+    def get_object(self, queryset=None):
+        if self._object is None:
+            self._object = super().get_object(queryset)
+        return self._object
+
+
+class UploadErrorsMixin:
+    """Передаёт форме ошибки, найденные обработчиком загрузки."""
+
+    def get_form_kwargs(self):
+        kwargs = super().get_form_kwargs()
+        kwargs['upload_errors'] = getattr(self.request, 'upload_errors', {})
+        return kwargs
 
 
-class PostMixin:
+class PostMixin(CachedObjectMixin):
     model = Post
     template_name = 'blog/create_post.html'
     pk_url_kwarg = 'post_id'
 
     def dispatch(self, request, *args, **kwargs):
-        if self.get_object().author != request.user:
+        if self.get_object().author_id != request.user.id:
             return redirect(
                 'blog:post_detail',
                 post_id=self.kwargs['post_id']
@@ -38,13 +211,13 @@ class PostMixin:
         return super().dispatch(request, *args, **kwargs)
 
 
-class CommentMixin:
+class CommentMixin(CachedObjectMixin):
     model = Comment
     template_name = 'blog/comment.html'
     pk_url_kwarg = 'comment_pk'
 
     def dispatch(self, request, *args, **kwargs):
-        if self.get_object().author != request.user:
+        if self.get_object().author_id != request.user.id:
             return redirect('blog:post_detail', post_id=self.kwargs['post_pk'])
         return super().dispatch(request, *args, **kwargs)
 
@@ -1,16 +1,33 @@
 from django.contrib.auth import get_user_model
-from django.db import models
+from django.db import models, transaction
+from django.db.models import Q
+from django.db.models.functions import Substr
 from django.urls import reverse
 from django.utils import timezone
 
+from blog.images import Renditions
 from blogicum.settings import MAX_LENGTH
 
 COUNT_SYMBOLS_FOR_TITLE_MODEL = 31
 POST_TITLE_LEN = 10
 COMMENT_TEXT_LEN = 15
+# Сколько символов текста читается из базы для карточки в ленте.
+POST_EXCERPT_LEN = 300
 User = get_user_model()
 
 
+def published_q(with_category=True):
+    """Условие, при котором пост виден всем читателям.
+
+    with_category=False пропускает проверку категории, когда вызывающий
+    код уже знает, что она опубликована.
+    """
+    condition = Q(is_published=True, pub_date__lte=timezone.now())
+    if with_category:
+        condition &= Q(category__is_published=True)
+    return condition
+
+
 class BaseModel(models.Model):
     """Базовая модель с флагом публикуемости и временем создания."""
 
@@ -23,6 +40,11 @@ class BaseModel(models.Model):
         auto_now_add=True,
         verbose_name='Добавлено',
     )
+    # Версия содержимого: входит в ключ кеша карточек публикаций.
+    updated_at = models.DateTimeField(
+        auto_now=True,
+        verbose_name='Изменено',
+    )
 
     class Meta:
         abstract = True
@@ -66,6 +88,52 @@ class Category(BaseModel):
         return self.title[:COUNT_SYMBOLS_FOR_TITLE_MODEL]
 
 
+class PostQuerySet(models.QuerySet):
+    """Выборки публикаций, общие для всех страниц блога."""
+
+    # Поля, которые выводит карточка публикации в ленте.
+    CARD_FIELDS = (
+        'title', 'pub_date', 'is_published', 'image', 'image_renditions',
+        'comment_count', 'updated_at',
+        'author', 'author__username',
+        'category', 'category__title', 'category__slug',
+        'category__is_published', 'category__updated_at',
+        'location', 'location__name', 'location__is_published',
+        'location__updated_at',
+        'image_meta__name', 'image_meta__width', 'image_meta__height',
+    )
+
+    def with_related(self):
+        return self.select_related(
+            'category', 'author', 'location', 'image_meta'
+        )
+
+    def for_cards(self):
+        """Только поля карточки и начало текста вместо всего текста."""
+        return self.with_related().only(*self.CARD_FIELDS).annotate(
+            excerpt=Substr('text', 1, POST_EXCERPT_LEN)
+        )
+
+    def published(self):
+        return self.filter(published_q())
+
+    def published_in(self, category):
+        """Опубликованные посты категории, которая сама опубликована.
+
+        Категория не присоединяется к запросу: её экземпляр уже есть у
+        вызывающего кода, и он подставляет его в посты сам.
+        """
+        return self.select_related(None).select_related(
+            'author', 'location', 'image_meta'
+        ).filter(published_q(with_category=False), category_id=category.pk)
+
+    def for_viewer(self, user):
+        """Опубликованные посты и, для вошедшего читателя, все его посты."""
+        if not user.is_authenticated:
+            return self.published()
+        return self.filter(published_q() | Q(author=user))
+
+
 class Post(BaseModel):
     """Модель постов."""
 
@@ -102,12 +170,41 @@ class Post(BaseModel):
         verbose_name="Картинка",
         null=True
     )
+    image_renditions = models.JSONField(
+        default=dict,
+        blank=True,
+        editable=False,
+        verbose_name='Готовые копии картинки',
+    )
+    comment_count = models.PositiveIntegerField(
+        default=0,
+        editable=False,
+        verbose_name='Количество комментариев',
+    )
+
+    objects = PostQuerySet.as_manager()
 
     class Meta:
         verbose_name = 'публикация'
         verbose_name_plural = 'Публикации'
         default_related_name = 'posts'
         ordering = ('-pub_date',)
+        indexes = (
+            models.Index(
+                fields=('-pub_date', '-id'),
+                name='post_feed_idx',
+                condition=models.Q(is_published=True),
+            ),
+            models.Index(
+                fields=('author', '-pub_date', '-id'),
+                name='post_author_feed_idx',
+            ),
+            models.Index(
+                fields=('category', '-pub_date', '-id'),
+                name='post_category_feed_idx',
+                condition=models.Q(is_published=True),
+            ),
+        )
 
     def __str__(self):
         return self.title[:COUNT_SYMBOLS_FOR_TITLE_MODEL]
@@ -115,6 +212,98 @@ class Post(BaseModel):
     def get_absolute_url(self):
         return reverse('blog:post_detail', kwargs={'post_id': self.pk})
 
+    @property
+    def renditions(self):
+        return Renditions(self.image, self.image_renditions)
+
+    @property
+    def image_info(self):
+        """Сохранённые размеры текущей картинки или None."""
+        try:
+            info = self.image_meta
+        except PostImage.DoesNotExist:
+            return None
+        return info if self.image and info.name == self.image.name else None
+
+
+class PostImage(models.Model):
+    """Размеры, объём и хеш картинки публикации, снятые при загрузке."""
+
+    post = models.OneToOneField(
+        Post,
+        on_delete=models.CASCADE,
+        related_name='image_meta',
+        verbose_name='публикация',
+    )
+    name = models.CharField(max_length=MAX_LENGTH, verbose_name='Файл')
+    width = models.PositiveIntegerField(verbose_name='Ширина')
+    height = models.PositiveIntegerField(verbose_name='Высота')
+    size = models.PositiveBigIntegerField(verbose_name='Размер в байтах')
+    sha256 = models.CharField(
+        max_length=64,
+        db_index=True,
+        verbose_name='SHA-256',
+    )
+
+    class Meta:
+        verbose_name = 'картинка публикации'
+        verbose_name_plural = 'Картинки публикаций'
+
+    def __str__(self):
+        return f'{self.name} {self.width}×{self.height}'
+
+
+class MediaBlob(models.Model):
+    """Файл хранилища с адресацией по содержимому и число ссылок на него.
+
+    Файл без ссылок удаляет команда collect_media вместе с копиями.
+    """
+
+    name = models.CharField(
+        max_length=MAX_LENGTH,
+        unique=True,
+        verbose_name='Файл',
+    )
+    sha256 = models.CharField(
+        max_length=64,
+        db_index=True,
+        verbose_name='SHA-256',
+    )
+    refcount = models.PositiveIntegerField(
+        default=0,
+        verbose_name='Число ссылок',
+    )
+
+    class Meta:
+        verbose_name = 'файл хранилища'
+        verbose_name_plural = 'Файлы хранилища'
+
+    def __str__(self):
+        return f'{self.name} ({self.refcount})'
+
+
+class ScheduledPublication(models.Model):
+    """Очередь отложенных публикаций для планировщика."""
+
+    post = models.OneToOneField(
+        Post,
+        on_delete=models.CASCADE,
+        related_name='schedule',
+        verbose_name='публикация',
+    )
+    publish_at = models.DateTimeField(
+        db_index=True,
+        verbose_name='Время публикации',
+    )
+
+    class Meta:
+        ordering = ('publish_at',)
+        verbose_name = 'отложенная публикация'
+        verbose_name_plural = 'Отложенные публикации'
+
+    def __str__(self):
+        return f'{self.post_id}: {self.publish_at:%Y-%m-%d %H:%M}'
+
 
 class Comment(models.Model):
     text = models.TextField('Текст комментария')
@@ -136,9 +325,24 @@ class Comment(models.Model):
 
     class Meta:
         ordering = ('created_at',)
+        indexes = (
+            models.Index(
+                fields=('post', 'created_at'),
+                name='comment_post_created_idx',
+            ),
+        )
         verbose_name = 'комментарий'
         verbose_name_plural = 'Комментарии'
 
+    def save(self, *args, **kwargs):
+        # Счётчик комментариев поста обновляется в той же транзакции.
+        with transaction.atomic():
+            super().save(*args, **kwargs)
+
+    def delete(self, *args, **kwargs):
+        with transaction.atomic():
+            return super().delete(*args, **kwargs)
+
     def __str__(self):
         return (
             f'{str(self.author)}: '
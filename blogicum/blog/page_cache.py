@@ -0,0 +1,92 @@
+"""Кеш готовых страниц ленты для анонимных читателей.
+
+Страница хранится под ключом из пути, номера страницы или курсора и
+версий её тегов. Событие в данных увеличивает версию тега, и все
+страницы с этим тегом перестают находиться; старые записи вытесняются
+по таймауту. Хранилище — кеш ``settings.PAGE_CACHE`` из ``CACHES``.
+"""
+import hashlib
+import time
+
+from django.conf import settings
+from django.core.cache import caches
+
+# Есть у каждой страницы: сбрасывает весь кеш страниц.
+GLOBAL_TAG = 'feed'
+INDEX_TAG = 'index'
+STATS_KEYS = ('hits', 'misses')
+
+
+def get_cache():
+    return caches[settings.PAGE_CACHE]
+
+
+def category_tag(slug):
+    return f'category:{slug}'
+
+
+def author_tag(username):
+    return f'author:{username}'
+
+
+def _tag_key(tag):
+    return f'blog:tag:{tag}'
+
+
+def get_tag_versions(tags):
+    """Текущие версии тегов за одно обращение к кешу."""
+    cache = get_cache()
+    keys = [_tag_key(tag) for tag in tags]
+    versions = cache.get_many(keys)
+    for key in keys:
+        if key not in versions:
+            # Начальная версия от времени: если тег вытеснили из кеша,
+            # страницы со старой версией уже не найдутся.
+            cache.add(key, time.time_ns(), timeout=None)
+            versions[key] = cache.get(key)
+    return [versions[key] for key in keys]
+
+
+def invalidate(*tags):
+    cache = get_cache()
+    for tag in set(tags):
+        try:
+            cache.incr(_tag_key(tag))
+        except ValueError:
+            cache.set(_tag_key(tag), time.time_ns(), timeout=None)
+
+
+def page_key(request, tags, params=()):
+    position = '&'.join(
+        f'{name}={request.GET[name]}' for name in params
+        if name in request.GET
+    )
+    versions = '.'.join(map(str, get_tag_versions(tags)))
+    digest = hashlib.md5(
+        f'{request.path}?{position}'.encode()
+    ).hexdigest()
+    return f'blog:page:{digest}:{versions}'
+
+
+def count(event):
+    cache = get_cache()
+    key = f'blog:page-stats:{event}'
+    try:
+        cache.incr(key)
+    except ValueError:
+        if not cache.add(key, 1, timeout=None):
+            cache.incr(key)
+
+
+def get_stats():
+    cache = get_cache()
+    return {
+        event: cache.get(f'blog:page-stats:{event}', 0)
+        for event in STATS_KEYS
+    }
+
+
+def reset_stats():
+    cache = get_cache()
+    for event in STATS_KEYS:
+        cache.delete(f'blog:page-stats:{event}')
@@ -0,0 +1,291 @@
+import json
+from collections.abc import Sequence
+from datetime import datetime
+from functools import partial
+from math import ceil
+
+from django.conf import settings
+from django.core.cache import cache
+from django.core.exceptions import FieldDoesNotExist
+from django.core.paginator import (EmptyPage, Page, PageNotAnInteger,
+                                   Paginator)
+from django.db import connections
+from django.db.models import DateField, Q
+from django.utils.encoding import force_str
+from django.utils.functional import cached_property
+from django.utils.http import urlsafe_base64_decode, urlsafe_base64_encode
+
+from blog.caching import get_feed_version
+
+
+class InvalidCursor(Exception):
+    pass
+
+
+def parse_date_value(value):
+    if not isinstance(value, str):
+        raise TypeError
+    return datetime.fromisoformat(value)
+
+
+def parse_number_value(value):
+    # bool — подкласс int, но числом позиции не бывает.
+    if isinstance(value, bool) or not isinstance(value, (int, float)):
+        raise TypeError
+    return value
+
+
+def parse_key_value(value):
+    if isinstance(value, bool) or not isinstance(value, int):
+        raise TypeError
+    return value
+
+
+class CursorPage(Sequence):
+    """Страница ленты, построенная по курсору без OFFSET."""
+
+    def __init__(self, object_list, paginator, has_next, has_previous):
+        self.object_list = object_list
+        self.paginator = paginator
+        self._has_next = has_next
+        self._has_previous = has_previous
+
+    def __repr__(self):
+        return f'<CursorPage of {len(self)} items>'
+
+    def __len__(self):
+        return len(self.object_list)
+
+    def __getitem__(self, index):
+        return self.object_list[index]
+
+    def has_next(self):
+        return self._has_next
+
+    def has_previous(self):
+        return self._has_previous
+
+    def has_other_pages(self):
+        return self.has_next() or self.has_previous()
+
+    @property
+    def next_cursor(self):
+        if self.has_next() and self.object_list:
+            return self.paginator.encode_cursor(self.object_list[-1])
+        return None
+
+    @property
+    def previous_cursor(self):
+        if self.has_previous() and self.object_list:
+            return self.paginator.encode_cursor(self.object_list[0])
+        return None
+
+
+class CursorPaginator:
+    """Keyset-пагинация по паре (поле сортировки, id).
+
+    По умолчанию лента идёт по дате публикации от новых к старым.
+    Стоимость любой страницы одинакова: вместо OFFSET выборка
+    продолжается с позиции последнего показанного объекта. Значение
+    сортировки в курсоре должно иметь тип поля: дата для полей модели
+    с датой, число для остальных (например, аннотации ``rank``).
+    """
+
+    def __init__(self, queryset, per_page, ordering=('pub_date', 'id'),
+                 descending=True):
+        self.per_page = int(per_page)
+        self.ordering = ordering
+        self.descending = descending
+        prefix = '-' if descending else ''
+        self.queryset = queryset.order_by(
+            *(f'{prefix}{field}' for field in ordering)
+        )
+        try:
+            sort_field = queryset.model._meta.get_field(ordering[0])
+        except FieldDoesNotExist:
+            sort_field = None
+        self.parse_sort_value = (
+            parse_date_value if isinstance(sort_field, DateField)
+            else parse_number_value
+        )
+
+    def encode_cursor(self, obj):
+        # Строки из values() приходят словарями.
+        get = obj.get if isinstance(obj, dict) else partial(getattr, obj)
+        sort_field, key_field = self.ordering
+        sort_value = get(sort_field)
+        if isinstance(sort_value, datetime):
+            sort_value = sort_value.isoformat()
+        position = [sort_value, get(key_field)]
+        return urlsafe_base64_encode(json.dumps(position).encode())
+
+    def decode_cursor(self, token):
+        try:
+            sort_value, key_value = json.loads(
+                force_str(urlsafe_base64_decode(token))
+            )
+            return (
+                self.parse_sort_value(sort_value), parse_key_value(key_value)
+            )
+        except (TypeError, ValueError):
+            raise InvalidCursor('Некорректный курсор страницы.')
+
+    def _seek(self, token, direction):
+        sort_field, key_field = self.ordering
+        sort_value, key_value = self.decode_cursor(token)
+        # Первое условие дублирует OR ниже, но позволяет базе начать
+        # чтение индекса прямо с позиции курсора.
+        position = Q(**{f'{sort_field}__{direction}e': sort_value}) & (
+            Q(**{f'{sort_field}__{direction}': sort_value})
+            | Q(**{
+                sort_field: sort_value,
+                f'{key_field}__{direction}': key_value,
+            })
+        )
+        queryset = self.queryset.filter(position)
+        if connections[queryset.db].vendor == 'sqlite':
+            queryset = self._hint_sqlite(queryset, sort_field, direction,
+                                         sort_value)
+        return queryset
+
+    @staticmethod
+    def _hint_sqlite(queryset, sort_field, direction, sort_value):
+        """Подсказывает SQLite вести индекс от позиции курсора.
+
+        Из двух границ по дате (курсор и «уже опубликовано») SQLite
+        берёт для диапазона индекса любую, и с границей «сейчас» каждая
+        следующая страница читает индекс с самого начала. likelihood()
+        помечает условие курсора как очень избирательное.
+        """
+        try:
+            field = queryset.model._meta.get_field(sort_field)
+        except FieldDoesNotExist:
+            return queryset
+        connection = connections[queryset.db]
+        column = connection.ops.quote_name(field.column)
+        table = connection.ops.quote_name(queryset.model._meta.db_table)
+        operator = '<=' if direction == 'lt' else '>='
+        return queryset.extra(
+            where=[f'likelihood({table}.{column} {operator} %s, 0.001)'],
+            params=[field.get_db_prep_value(sort_value, connection)],
+        )
+
+    def page(self, after=None, before=None):
+        forward, backward = ('lt', 'gt') if self.descending else ('gt', 'lt')
+        if before:
+            rows = list(
+                self._seek(before, backward)
+                .reverse()[:self.per_page + 1]
+            )
+            has_previous = len(rows) > self.per_page
+            rows = rows[:self.per_page][::-1]
+            return CursorPage(rows, self, True, has_previous)
+        queryset = self.queryset
+        if after:
+            queryset = self._seek(after, forward)
+        rows = list(queryset[:self.per_page + 1])
+        has_next = len(rows) > self.per_page
+        return CursorPage(rows[:self.per_page], self, has_next, bool(after))
+
+
+class TruncatedPage(Page):
+    """Страница пагинатора, которому не известно точное число страниц."""
+
+    def __init__(self, object_list, number, paginator, has_next):
+        super().__init__(object_list, number, paginator)
+        self._has_next = has_next
+
+    def has_next(self):
+        return self._has_next
+
+
+class CachedCountPaginator(Paginator):
+    """Нумерованный пагинатор, который не считает ленту на каждый запрос.
+
+    Число публикаций кешируется по ключу представления и сбрасывается,
+    когда публикации или категории снимаются с публикации или
+    возвращаются в ленту. Если задан ``count_limit``, подсчёт
+    останавливается на этом числе и вместо последней страницы
+    показывается «много страниц».
+    """
+
+    def __init__(self, object_list, per_page, orphans=0,
+                 allow_empty_first_page=True, cache_key=None,
+                 count_limit=None, timeout=None):
+        super().__init__(object_list, per_page, orphans,
+                         allow_empty_first_page)
+        self.cache_key = cache_key
+        self.count_limit = (
+            settings.FEED_COUNT_LIMIT if count_limit is None else count_limit
+        )
+        self.timeout = (
+            settings.FEED_COUNT_CACHE_TIMEOUT if timeout is None else timeout
+        )
+
+    def _count(self):
+        if self.count_limit:
+            return self.object_list[:self.count_limit + 1].count()
+        return self.object_list.count()
+
+    @cached_property
+    def count(self):
+        if self.cache_key is None:
+            return self._count()
+        key = f'blog:count:{get_feed_version()}:{self.cache_key}'
+        count = cache.get(key)
+        if count is None:
+            count = self._count()
+            cache.set(key, count, self.timeout)
+        return count
+
+    @cached_property
+    def is_truncated(self):
+        return bool(self.count_limit) and self.count > self.count_limit
+
+    def validate_number(self, number):
+        if not self.is_truncated:
+            return super().validate_number(number)
+        # Точное число страниц неизвестно: пустоту проверит page().
+        try:
+            number = int(number)
+        except (TypeError, ValueError):
+            raise PageNotAnInteger('That page number is not an integer')
+        if number < 1:
+            raise EmptyPage('That page number is less than 1')
+        return number
+
+    def page(self, number):
+        if not self.is_truncated:
+            return super().page(number)
+        number = self.validate_number(number)
+        bottom = (number - 1) * self.per_page
+        rows = list(self.object_list[bottom:bottom + self.per_page + 1])
+        if number > 1 and not rows:
+            raise EmptyPage('That page contains no results')
+        return TruncatedPage(
+            rows[:self.per_page], number, self, len(rows) > self.per_page
+        )
+
+    def get_elided_page_range(self, number=1, *, on_each_side=3, on_ends=2):
+        if not self.is_truncated:
+            yield from super().get_elided_page_range(
+                number, on_each_side=on_each_side, on_ends=on_ends
+            )
+            return
+        # Последняя страница неизвестна: после окна всегда многоточие.
+        number = self.validate_number(number)
+        start = max(number - on_each_side, 1)
+        if start > on_ends + 1:
+            yield from range(1, on_ends + 1)
+            yield self.ELLIPSIS
+        else:
+            start = 1
+        end = max(min(number + on_each_side, self.num_pages), number)
+        yield from range(start, end + 1)
+        yield self.ELLIPSIS
+
+    @cached_property
+    def num_pages(self):
+        if self.is_truncated:
+            return ceil(self.count_limit / self.per_page)
+        return super().num_pages
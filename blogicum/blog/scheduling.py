@@ -0,0 +1,52 @@
+"""Отложенные публикации.
+
+Посты с ``pub_date`` в будущем попадают в очередь
+``ScheduledPublication``. Команда ``publish_scheduled`` спит до
+ближайшего времени из очереди и в этот момент отправляет сигнал
+``post_published``, по которому сбрасываются кеши ленты.
+"""
+from django.dispatch import Signal
+from django.utils import timezone
+
+from blog.models import Post, ScheduledPublication
+
+# Отправляется с аргументом instance, когда наступает pub_date поста.
+post_published = Signal()
+
+
+def sync_schedule(post, now=None):
+    """Ставит пост в очередь или убирает из неё по его pub_date."""
+    now = now or timezone.now()
+    if post.is_published and post.pub_date > now:
+        ScheduledPublication.objects.update_or_create(
+            post_id=post.pk, defaults={'publish_at': post.pub_date}
+        )
+    else:
+        ScheduledPublication.objects.filter(post_id=post.pk).delete()
+
+
+def next_publication_time():
+    return ScheduledPublication.objects.values_list(
+        'publish_at', flat=True
+    ).first()
+
+
+def publish_due(now=None):
+    """Отправляет post_published для наступивших публикаций.
+
+    Возвращает список опубликованных постов.
+    """
+    now = now or timezone.now()
+    due = ScheduledPublication.objects.filter(
+        publish_at__lte=now
+    ).select_related('post')
+    published = []
+    for entry in due:
+        # Запись могли забрать другой воркер или перенос pub_date.
+        deleted, _ = ScheduledPublication.objects.filter(
+            pk=entry.pk, publish_at=entry.publish_at
+        ).delete()
+        if deleted:
+            post_published.send(sender=Post, instance=entry.post)
+            published.append(entry.post)
+    return published
@@ -0,0 +1,120 @@
+"""Полнотекстовый поиск по публикациям на SQLite FTS5.
+
+Индекс ``blog_post_fts`` хранит только токены заголовка и текста и
+ссылается на строки ``blog_post`` (external content). Его поддерживают
+триггеры; на других СУБД поиск деградирует до ``icontains``.
+"""
+import re
+
+from django.db import connection
+from django.db.models import FloatField, Q
+from django.db.models.expressions import RawSQL
+
+FTS_TABLE = 'blog_post_fts'
+
+CREATE_TABLE = (
+    f'CREATE VIRTUAL TABLE IF NOT EXISTS {FTS_TABLE} USING fts5('
+    "title, text, content='blog_post', content_rowid='id', "
+    "tokenize='unicode61 remove_diacritics 2')"
+)
+
+TRIGGERS = {
+    f'{FTS_TABLE}_ai': (
+        'AFTER INSERT ON blog_post BEGIN '
+        f'INSERT INTO {FTS_TABLE}(rowid, title, text) '
+        'VALUES (new.id, new.title, new.text); END'
+    ),
+    f'{FTS_TABLE}_ad': (
+        'AFTER DELETE ON blog_post BEGIN '
+        f'INSERT INTO {FTS_TABLE}({FTS_TABLE}, rowid, title, text) '
+        "VALUES ('delete', old.id, old.title, old.text); END"
+    ),
+    f'{FTS_TABLE}_au': (
+        'AFTER UPDATE OF title, text ON blog_post BEGIN '
+        f'INSERT INTO {FTS_TABLE}({FTS_TABLE}, rowid, title, text) '
+        "VALUES ('delete', old.id, old.title, old.text); "
+        f'INSERT INTO {FTS_TABLE}(rowid, title, text) '
+        'VALUES (new.id, new.title, new.text); END'
+    ),
+}
+
+WORD_RE = re.compile(r'\w+')
+
+
+def is_supported(using=connection):
+    return using.vendor == 'sqlite'
+
+
+def install(using=connection):
+    """Создаёт индекс и недостающие триггеры.
+
+    SQLite пересоздаёт таблицу при изменении её схемы, и триггеры
+    пропадают вместе со старой таблицей. Если пришлось их вернуть,
+    индекс перестраивается целиком. Возвращает True в этом случае.
+    """
+    if not is_supported(using):
+        return False
+    with using.cursor() as cursor:
+        cursor.execute(CREATE_TABLE)
+        cursor.execute(
+            "SELECT name FROM sqlite_master WHERE type = 'trigger' "
+            'AND tbl_name = %s', ['blog_post']
+        )
+        existing = {name for name, in cursor.fetchall()}
+        missing = [name for name in TRIGGERS if name not in existing]
+        for name in missing:
+            cursor.execute(f'CREATE TRIGGER {name} {TRIGGERS[name]}')
+    if missing:
+        rebuild(using)
+    return bool(missing)
+
+
+def uninstall(using=connection):
+    if not is_supported(using):
+        return
+    with using.cursor() as cursor:
+        for name in TRIGGERS:
+            cursor.execute(f'DROP TRIGGER IF EXISTS {name}')
+        cursor.execute(f'DROP TABLE IF EXISTS {FTS_TABLE}')
+
+
+def rebuild(using=connection):
+    with using.cursor() as cursor:
+        cursor.execute(
+            f"INSERT INTO {FTS_TABLE}({FTS_TABLE}) VALUES ('rebuild')"
+        )
+
+
+def build_match(query):
+    """Превращает пользовательский ввод в безопасный запрос FTS5.
+
+    Каждое слово ищется по префиксу, все слова обязательны.
+    """
+    words = WORD_RE.findall(query or '')
+    return ' '.join(f'"{word}"*' for word in words) or None
+
+
+def search_posts(queryset, query):
+    """Отбирает публикации по запросу и добавляет ранг ``rank``.
+
+    Чем меньше ранг, тем выше релевантность (BM25 в SQLite
+    отрицательный), поэтому сортировать нужно по возрастанию.
+    """
+    match = build_match(query)
+    if match is None or not is_supported(connection):
+        condition = Q(pk__in=[]) if match is None else Q()
+        for word in WORD_RE.findall(query or ''):
+            condition &= Q(title__icontains=word) | Q(text__icontains=word)
+        return queryset.filter(condition).annotate(
+            rank=RawSQL('0', (), output_field=FloatField())
+        )
+    return queryset.extra(
+        tables=[FTS_TABLE],
+        where=[
+            f'{FTS_TABLE}.rowid = blog_post.id',
+            f'{FTS_TABLE} MATCH %s',
+        ],
+        params=[match],
+    ).annotate(
+        rank=RawSQL(f'bm25({FTS_TABLE})', (), output_field=FloatField())
+    )
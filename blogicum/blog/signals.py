@@ -0,0 +1,212 @@
+from django.conf import settings
+from django.db import IntegrityError, connections, transaction
+from django.db.backends.signals import connection_created
+from django.db.models import F
+from django.db.models.signals import (post_delete, post_migrate, post_save,
+                                      pre_save)
+from django.dispatch import receiver
+from django.utils import timezone
+
+from blog import page_cache, search
+from blog.caching import bump_feed_version, clear_category_cache
+from blog.images import describe, renditions_ready
+from blog.models import (Category, Comment, Location, MediaBlob, Post,
+                         PostImage, User)
+from blog.scheduling import post_published, sync_schedule
+from blog.storage import digest_from_name, is_blob_name
+
+FEED_VISIBILITY_FIELDS = ('is_published', 'pub_date', 'category_id',
+                          'author_id')
+
+
+def change_comment_count(post_id, delta):
+    posts = Post.objects.filter(pk=post_id)
+    if delta < 0:
+        # Не уходим в минус, если счётчик уже разошёлся с данными.
+        posts = posts.filter(comment_count__gte=-delta)
+    posts.update(comment_count=F('comment_count') + delta)
+
+
+def change_blob_refs(name, delta):
+    """Меняет число ссылок на файл хранилища с адресацией по содержимому."""
+    if not (name and is_blob_name(name)):
+        return
+    blobs = MediaBlob.objects.filter(name=name)
+    if delta < 0:
+        blobs.filter(refcount__gte=-delta).update(
+            refcount=F('refcount') + delta
+        )
+        return
+    # Без отдельного чтения: collect_media может удалить пустую запись
+    # между get_or_create() и update().
+    if blobs.update(refcount=F('refcount') + delta):
+        return
+    try:
+        with transaction.atomic():
+            MediaBlob.objects.create(
+                name=name, sha256=digest_from_name(name), refcount=delta
+            )
+    except IntegrityError:
+        blobs.update(refcount=F('refcount') + delta)
+
+
+def invalidate_comment_pages(comment):
+    # Число комментариев выводится в карточке поста.
+    post = Post.objects.filter(pk=comment.post_id).values_list(
+        'category_id', 'author_id'
+    ).first()
+    if post:
+        invalidate_post_pages({post[0]}, {post[1]})
+
+
+@receiver(post_save, sender=Comment)
+def comment_created(sender, instance, created, raw=False, **kwargs):
+    if created and not raw:
+        change_comment_count(instance.post_id, 1)
+        invalidate_comment_pages(instance)
+
+
+@receiver(post_delete, sender=Comment)
+def comment_deleted(sender, instance, **kwargs):
+    # Срабатывает и при каскадном удалении вместе с постом или автором.
+    change_comment_count(instance.post_id, -1)
+    invalidate_comment_pages(instance)
+
+
+def invalidate_post_pages(category_ids, author_ids):
+    """Сбрасывает кеш страниц, на которых выводятся карточки постов."""
+    slugs = Category.objects.filter(
+        pk__in=[pk for pk in category_ids if pk]
+    ).values_list('slug', flat=True)
+    usernames = User.objects.filter(
+        pk__in=author_ids
+    ).values_list('username', flat=True)
+    page_cache.invalidate(
+        page_cache.INDEX_TAG,
+        *map(page_cache.category_tag, slugs),
+        *map(page_cache.author_tag, usernames),
+    )
+
+
+@receiver(post_save, sender=Comment)
+@receiver(post_delete, sender=Comment)
+def touch_commented_post(sender, instance, raw=False, **kwargs):
+    # У комментариев нет своей версии: меняется версия поста.
+    if not raw:
+        Post.objects.filter(pk=instance.post_id).update(
+            updated_at=timezone.now()
+        )
+
+
+@receiver(pre_save, sender=Post)
+def remember_post_visibility(sender, instance, raw=False, **kwargs):
+    instance._feed_before = image_before = None
+    if not (raw or instance._state.adding):
+        before = (
+            sender.objects.filter(pk=instance.pk)
+            .values_list(*FEED_VISIBILITY_FIELDS, 'image').first()
+        )
+        if before:
+            instance._feed_before, image_before = before[:-1], before[-1]
+    instance._image_before = image_before
+    instance._image_changed = not raw and (
+        (instance.image.name or None) != (image_before or None)
+    )
+    if instance._image_changed:
+        # Копии старой картинки к новой не подходят.
+        instance.image_renditions = {}
+    instance._feed_changed = raw or instance._state.adding or (
+        instance._feed_before
+        != tuple(getattr(instance, name) for name in FEED_VISIBILITY_FIELDS)
+    )
+
+
+@receiver(post_save, sender=Post)
+def post_saved(sender, instance, **kwargs):
+    if getattr(instance, '_feed_changed', True):
+        sync_schedule(instance)
+        bump_feed_version()
+    category_ids, author_ids = {instance.category_id}, {instance.author_id}
+    before = getattr(instance, '_feed_before', None)
+    if before:
+        # Пост мог уйти из старой категории или профиля.
+        category_ids.add(before[2])
+        author_ids.add(before[3])
+    invalidate_post_pages(category_ids, author_ids)
+    if getattr(instance, '_image_changed', False):
+        change_blob_refs(instance.image.name, 1)
+        change_blob_refs(instance._image_before, -1)
+        store_image_info(instance)
+
+
+def store_image_info(post):
+    if not post.image:
+        PostImage.objects.filter(post=post).delete()
+        return
+    info, _ = PostImage.objects.update_or_create(
+        post=post, defaults=describe(post.image)
+    )
+    post.image_meta = info
+
+
+@receiver(post_delete, sender=Post)
+def post_deleted(sender, instance, **kwargs):
+    # Вызывается и при каскадном удалении вместе с автором.
+    change_blob_refs(instance.image.name, -1)
+    invalidate_post_pages({instance.category_id}, {instance.author_id})
+
+
+@receiver(post_published)
+def scheduled_post_published(sender, instance, **kwargs):
+    # Пост с pub_date в будущем стал виден без сохранения.
+    bump_feed_version()
+    invalidate_post_pages({instance.category_id}, {instance.author_id})
+
+
+@receiver(renditions_ready)
+def post_renditions_ready(sender, instance, **kwargs):
+    # Копии записываются через update(), без post_save.
+    invalidate_post_pages({instance.category_id}, {instance.author_id})
+
+
+@receiver(post_save, sender=Category)
+@receiver(post_delete, sender=Category)
+@receiver(post_delete, sender=Post)
+def feed_changed(sender, **kwargs):
+    bump_feed_version()
+
+
+@receiver(post_save, sender=Category)
+@receiver(post_delete, sender=Category)
+def category_changed(sender, **kwargs):
+    clear_category_cache()
+
+
+@receiver(post_save, sender=Category)
+@receiver(post_delete, sender=Category)
+@receiver(post_save, sender=Location)
+@receiver(post_delete, sender=Location)
+@receiver(post_save, sender=User)
+@receiver(post_delete, sender=User)
+def shared_data_changed(sender, update_fields=None, **kwargs):
+    # Категории, места и авторы выводятся в карточках на всех страницах.
+    # Вход пользователя меняет только last_login и кеш не трогает.
+    if update_fields and set(update_fields) == {'last_login'}:
+        return
+    page_cache.invalidate(page_cache.GLOBAL_TAG)
+
+
+@receiver(connection_created)
+def apply_sqlite_pragmas(sender, connection, **kwargs):
+    if connection.vendor != 'sqlite':
+        return
+    with connection.cursor() as cursor:
+        for name, value in settings.SQLITE_PRAGMAS.items():
+            cursor.execute(f'PRAGMA {name} = {value}')
+
+
+@receiver(post_migrate)
+def restore_search_index(sender, using, **kwargs):
+    # Изменение схемы blog_post в SQLite удаляет триггеры поиска.
+    if sender.name == 'blog':
+        search.install(connections[using])
@@ -0,0 +1,85 @@
+"""Хранилище медиафайлов с адресацией по содержимому.
+
+Загруженный файл сохраняется под именем из своего SHA-256:
+``blobs/3f/a2/3fa2….jpg``. Одинаковые загрузки получают одно имя и
+один файл на диске. Производные файлы (копии картинок) пишет
+``save_derived()`` под заданным именем, в том числе рядом со старыми
+оригиналами вне ``blobs/``. Сколько постов ссылается на файл,
+считает модель ``MediaBlob``; неиспользуемые файлы удаляет команда
+``collect_media``.
+"""
+import hashlib
+import os
+import re
+import tempfile
+
+from django.core.files.storage import FileSystemStorage
+
+BLOB_DIR = 'blobs'
+# Хеш в начале имени файла внутри BLOB_DIR, в том числе у копий.
+DIGEST_RE = re.compile(r'^([0-9a-f]{64})(?:[._]|$)')
+
+
+def digest_from_name(name):
+    """SHA-256 из имени блоба или его производного файла, иначе None."""
+    match = DIGEST_RE.match(os.path.basename(name))
+    return match[1] if match else None
+
+
+def is_blob_name(name):
+    return name.replace('\\', '/').startswith(f'{BLOB_DIR}/')
+
+
+class ContentAddressedStorage(FileSystemStorage):
+
+    content_addressed = True
+
+    def blob_name(self, digest, name):
+        extension = os.path.splitext(name)[1].lower()
+        return f'{BLOB_DIR}/{digest[:2]}/{digest[2:4]}/{digest}{extension}'
+
+    def save_derived(self, name, content):
+        """Сохраняет производный файл ровно под этим именем.
+
+        Прежний файл с тем же именем заменяется: копия строится заново
+        из того же оригинала.
+        """
+        return self._write(self.generate_filename(name), content)
+
+    def _save(self, name, content):
+        digest = hashlib.sha256()
+        for chunk in content.chunks():
+            digest.update(chunk)
+        name = self.blob_name(digest.hexdigest(), name)
+        if self.exists(name):
+            # Свежая дата изменения защищает файл от collect_media,
+            # пока пост с ним ещё не сохранён.
+            os.utime(self.path(name))
+            return name
+        return self._write(name, content)
+
+    def _write(self, name, content):
+        """Пишет во временный файл и атомарно переименовывает его.
+
+        Параллельные загрузки одного содержимого просто заменяют файл
+        таким же, и читатель никогда не видит его недописанным.
+        """
+        full_path = self.path(name)
+        directory = os.path.dirname(full_path)
+        os.makedirs(directory, exist_ok=True)
+        if self.directory_permissions_mode is not None:
+            os.chmod(directory, self.directory_permissions_mode)
+        fd, temp_path = tempfile.mkstemp(dir=directory, prefix='.tmp-')
+        try:
+            with os.fdopen(fd, 'wb') as output:
+                content.seek(0)
+                for chunk in content.chunks():
+                    output.write(chunk)
+            if self.file_permissions_mode is not None:
+                os.chmod(temp_path, self.file_permissions_mode)
+            os.replace(temp_path, full_path)
+        except BaseException:
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
+            raise
+        return name
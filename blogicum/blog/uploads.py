@@ -0,0 +1,157 @@
+"""Приём картинок публикаций прямо из потока запроса.
+
+Обработчик стоит первым в ``FILE_UPLOAD_HANDLERS`` и забирает себе
+файлы из полей ``field_names``. Тип проверяется по первым байтам
+файла, объём — по мере приёма. Неподходящий файл отбрасывается, не
+дочитываясь до диска: остаток запроса Django пропускает, а причину
+обработчик сохраняет в ``request.upload_errors`` для формы. Принятая
+картинка с метаданными перекодируется в пуле процессов без них: так
+из файла уходят координаты съёмки и прочее. ICC-профиль и плотность
+сохраняются, анимация остаётся анимацией, а файл без метаданных
+принимается как есть, без потерь от повторного сжатия.
+"""
+import os
+
+from django.conf import settings
+from django.core.files.uploadedfile import TemporaryUploadedFile
+from django.core.files.uploadhandler import (SkipFile, StopFutureHandlers,
+                                             TemporaryFileUploadHandler)
+from django.template.defaultfilters import filesizeformat
+from PIL import Image, ImageOps
+
+from blog.images import EXIF_ORIENTATION, get_executor
+
+# Сколько первых байт нужно, чтобы узнать формат.
+HEAD_SIZE = 12
+SIGNATURES = {
+    'JPEG': (b'\xff\xd8\xff',),
+    'PNG': (b'\x89PNG\r\n\x1a\n',),
+    'GIF': (b'GIF87a', b'GIF89a'),
+}
+# Метаданные, без которых картинка отобразится иначе.
+KEPT_INFO = ('icc_profile', 'dpi')
+# Сегменты JPEG с EXIF, XMP, IPTC и комментариями.
+JPEG_METADATA = ('APP1', 'APP13', 'COM')
+METADATA_INFO = ('exif', 'xmp', 'XML:com.adobe.xmp', 'comment')
+
+
+def sniff(head):
+    """Формат Pillow по сигнатуре файла или None."""
+    for fmt, signatures in SIGNATURES.items():
+        if head.startswith(signatures):
+            return fmt
+    if head[:4] == b'RIFF' and head[8:12] == b'WEBP':
+        return 'WEBP'
+    return None
+
+
+def has_metadata(image):
+    if any(marker in JPEG_METADATA for marker, _ in
+           getattr(image, 'applist', ())):
+        return True
+    # Текстовые блоки PNG.
+    if getattr(image, 'text', None):
+        return True
+    return any(key in image.info for key in METADATA_INFO)
+
+
+def reencode(source, target, fmt):
+    """Сохраняет картинку без метаданных; выполняется в процессе пула.
+
+    Возвращает False, если убирать нечего и файл можно оставить как
+    есть. Кодировщики Pillow берут профиль и плотность только из
+    аргументов save(), поэтому они передаются явно.
+    """
+    with Image.open(source) as image:
+        if not has_metadata(image):
+            return False
+        options = {
+            key: image.info[key] for key in KEPT_INFO if key in image.info
+        }
+        options.update(exif=b'', xmp=b'')
+        if getattr(image, 'n_frames', 1) > 1:
+            # Поворот оставил бы один кадр.
+            image.save(target, fmt, save_all=True, **options)
+            return True
+        if fmt == 'JPEG' and image.getexif().get(EXIF_ORIENTATION, 1) == 1:
+            # Те же таблицы квантования: качество почти не теряется.
+            image.save(target, fmt, quality='keep', subsampling='keep',
+                       **options)
+            return True
+        image = ImageOps.exif_transpose(image)
+        if fmt in ('JPEG', 'WEBP'):
+            options['quality'] = settings.POST_UPLOAD_QUALITY
+        image.save(target, fmt, **options)
+        return True
+
+
+class ImageUploadHandler(TemporaryFileUploadHandler):
+
+    field_names = ('image',)
+    active = False
+
+    def record_error(self, message):
+        errors = getattr(self.request, 'upload_errors', {})
+        errors[self.field_name] = message
+        self.request.upload_errors = errors
+
+    def reject(self, message):
+        self.record_error(message)
+        raise SkipFile(message)
+
+    def new_file(self, field_name, *args, **kwargs):
+        self.active = field_name in self.field_names
+        if not self.active:
+            return
+        super().new_file(field_name, *args, **kwargs)
+        self.head = b''
+        self.format = None
+        self.received = 0
+        raise StopFutureHandlers()
+
+    def receive_data_chunk(self, raw_data, start):
+        if not self.active:
+            return raw_data
+        self.received += len(raw_data)
+        if self.received > settings.POST_IMAGE_MAX_SIZE:
+            self.reject('Картинка больше '
+                        f'{filesizeformat(settings.POST_IMAGE_MAX_SIZE)}.')
+        if self.format is None and len(self.head) < HEAD_SIZE:
+            self.head = (self.head + raw_data)[:HEAD_SIZE]
+            if len(self.head) == HEAD_SIZE:
+                self.format = sniff(self.head)
+                if self.format is None:
+                    self.reject('Загрузите картинку в формате JPEG, PNG,'
+                                ' GIF или WebP.')
+        return super().receive_data_chunk(raw_data, start)
+
+    def file_complete(self, file_size):
+        if not self.active:
+            return None
+        self.active = False
+        source = super().file_complete(file_size)
+        if self.format in (None, 'GIF'):
+            # Слишком короткий файл отклонит проверка поля формы,
+            # а в GIF нет EXIF.
+            return source
+        source.file.flush()
+        target = TemporaryUploadedFile(
+            source.name, source.content_type, 0, source.charset,
+            source.content_type_extra,
+        )
+        try:
+            changed = get_executor().submit(
+                reencode, source.temporary_file_path(),
+                target.temporary_file_path(), self.format,
+            ).result()
+        except Exception:
+            target.close()
+            self.record_error('Не удалось прочитать картинку.')
+            return source
+        if not changed:
+            target.close()
+            return source
+        source.close()
+        target.size = os.path.getsize(target.temporary_file_path())
+        target.seek(0)
+        return target
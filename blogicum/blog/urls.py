@@ -1,6 +1,6 @@
 from django.urls import include, path
 
-from . import views
+from . import api, views
 
 app_name = 'blog'
 posts_urls = [
@@ -14,6 +14,9 @@ posts_urls = [
     path('<int:post_id>/delete/',
          views.PostDeleteView.as_view(),
          name='delete_post'),
+    path('<int:post_id>/comments/',
+         views.CommentListView.as_view(),
+         name='post_comments'),
     path('<int:post_pk>/comment/',
          views.CommentCreateView.as_view(),
          name='add_comment'),
@@ -25,7 +28,21 @@ posts_urls = [
          name='delete_comment'),
 ]
 
+api_urls = [
+    path('posts/', api.PostListApiView.as_view(), name='api_posts'),
+    path('posts/<int:post_id>/',
+         api.PostDetailApiView.as_view(),
+         name='api_post_detail'),
+    path('posts/<int:post_id>/comments/',
+         api.CommentListApiView.as_view(),
+         name='api_post_comments'),
+    path('categories/<slug:category_slug>/posts/',
+         api.CategoryPostListApiView.as_view(),
+         name='api_category_posts'),
+]
+
 urlpatterns = [
+    path('api/v1/', include(api_urls)),
     path('posts/', include(posts_urls)),
     path('', views.IndexListView.as_view(), name='index'),
     path('profile/<slug:username_slug>/',
@@ -34,6 +51,7 @@ urlpatterns = [
     path('edit_profile/',
          views.ProfileUpdateView.as_view(),
          name='edit_profile'),
+    path('search/', views.SearchListView.as_view(), name='search'),
     path('category/<slug:category_slug>/',
          views.CategoryListView.as_view(),
          name='category_posts'),
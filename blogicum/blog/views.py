@@ -4,64 +4,127 @@ from django.contrib.auth.models import User
 from django.http import Http404
 from django.shortcuts import get_object_or_404
 from django.urls import reverse
-from django.utils import timezone
 from django.views.generic import (CreateView, DeleteView, DetailView, ListView,
                                   UpdateView)
 
 from .forms import CommentForm, PostForm
-from .mixins import CommentMixin, PostMixin, PostsMixin
-from .models import Category, Comment, Post, User
+from . import page_cache
+from .caching import get_published_category
+from .mixins import (CachedObjectMixin, CommentMixin, ConditionalGetMixin,
+                     PageCacheMixin, PostMixin, PostsMixin, UploadErrorsMixin)
+from .models import Comment, Post, User
+from .paginators import CursorPaginator, InvalidCursor
+from .search import search_posts
 
 
-class IndexListView(PostsMixin, ListView):
+class IndexListView(PageCacheMixin, PostsMixin, ListView):
     template_name = 'blog/index.html'
 
+    def get_page_cache_tags(self):
+        return [*super().get_page_cache_tags(), page_cache.INDEX_TAG]
 
-class CategoryListView(PostsMixin, ListView):
+
+class CategoryListView(PageCacheMixin, PostsMixin, ListView):
     template_name = 'blog/category.html'
     category_obj = None
 
+    def get_page_cache_tags(self):
+        return [
+            *super().get_page_cache_tags(),
+            page_cache.category_tag(self.kwargs['category_slug']),
+        ]
+
     def get_queryset(self):
-        self.category_obj = get_object_or_404(
-            Category,
-            slug=self.kwargs['category_slug'],
-            is_published=True,
+        self.category_obj = get_published_category(
+            self.kwargs['category_slug']
         )
-        return super().get_queryset().filter(category=self.category_obj)
+        if self.category_obj is None:
+            raise Http404
+        return self.all_posts().published_in(self.category_obj)
 
     def get_context_data(self, *, object_list=None, **kwargs):
         context = super().get_context_data(object_list=None, **kwargs)
         context['category'] = self.category_obj
+        # Категория не выбиралась вместе с постами.
+        for post in context['page_obj']:
+            post.category = self.category_obj
         return context
 
 
-class PostDetailView(DetailView):
+class SearchListView(PostsMixin, ListView):
+    template_name = 'blog/search.html'
+    cursor_ordering = ('rank', 'id')
+    cursor_descending = False
+
+    def get_queryset(self):
+        self.query = self.request.GET.get('q', '').strip()
+        return search_posts(super().get_queryset(), self.query)
+
+    def get_count_cache_key(self):
+        return None
+
+    def get_context_data(self, *, object_list=None, **kwargs):
+        context = super().get_context_data(object_list=None, **kwargs)
+        context['query'] = self.query
+        return context
+
+
+class PostDetailView(ConditionalGetMixin, CachedObjectMixin, DetailView):
     model = Post
     template_name = 'blog/detail.html'
     pk_url_kwarg = 'post_id'
+    comments_per_page = 10
+    read_replica = True
 
-    def get_object(self, queryset=None):
-        post_obj = get_object_or_404(
-            Post,
-            pk=self.kwargs['post_id']
+    def get_queryset(self):
+        return Post.objects.with_related().for_viewer(self.request.user)
+
+    def get_last_modified(self):
+        # Комментарии обновляют updated_at поста, см. blog.signals.
+        post = self.get_object()
+        return max(
+            obj.updated_at
+            for obj in (post, post.category, post.location) if obj
         )
-        if post_obj.author != self.request.user:
-            if (
-                    not post_obj.is_published
-                    or not post_obj.category.is_published
-                    or post_obj.pub_date > timezone.now()
-            ):
-                raise Http404
-        return post_obj
+
+    def get_etag(self):
+        # Кнопки и форма на странице зависят от читателя.
+        return (
+            f'{self.get_last_modified().isoformat()}:'
+            f'{self.request.user.pk}'
+        )
+
+    def get_comments_page(self):
+        paginator = CursorPaginator(
+            self.object.comments.select_related('author'),
+            self.comments_per_page,
+            ordering=('created_at', 'id'),
+            descending=False,
+        )
+        try:
+            return paginator.page(after=self.request.GET.get('after'))
+        except InvalidCursor as error:
+            raise Http404(error)
 
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
         context['form'] = CommentForm()
-        context['comments'] = self.object.comments.select_related('author')
+        context['comments'] = self.get_comments_page()
         return context
 
 
-class PostCreateView(LoginRequiredMixin, CreateView):
+class CommentListView(PostDetailView):
+    """Следующая порция комментариев поста в виде HTML-фрагмента."""
+
+    template_name = 'includes/comment_list.html'
+
+    def get_context_data(self, **kwargs):
+        context = super(PostDetailView, self).get_context_data(**kwargs)
+        context['comments'] = self.get_comments_page()
+        return context
+
+
+class PostCreateView(LoginRequiredMixin, UploadErrorsMixin, CreateView):
     form_class = PostForm
     template_name = 'blog/create_post.html'
 
@@ -73,7 +136,9 @@ class PostCreateView(LoginRequiredMixin, CreateView):
         return super().form_valid(form)
 
 
-class PostUpdateView(LoginRequiredMixin, PostMixin, UpdateView):
+class PostUpdateView(
+        LoginRequiredMixin, PostMixin, UploadErrorsMixin, UpdateView
+):
     form_class = PostForm
 
 
@@ -87,23 +152,30 @@ class PostDeleteView(LoginRequiredMixin, PostMixin, DeleteView):
         return reverse('blog:profile', args=[self.request.user.username])
 
 
-class ProfileListView(PostsMixin, ListView):
+class ProfileListView(PageCacheMixin, PostsMixin, ListView):
     template_name = 'blog/profile.html'
     current_user = None
 
+    def get_page_cache_tags(self):
+        return [
+            *super().get_page_cache_tags(),
+            page_cache.author_tag(self.kwargs['username_slug']),
+        ]
+
     def get_queryset(self):
         self.current_user = get_object_or_404(
             User,
             username=self.kwargs['username_slug']
         )
-        if self.request.user.username == self.kwargs['username_slug']:
-            return self.all_posts().filter(
-                author__username=self.kwargs['username_slug'],
-            )
-        else:
-            return super().get_queryset().filter(
-                author__username=self.kwargs['username_slug'],
-            )
+        # Автор видит в профиле и свои неопубликованные посты.
+        return self.all_posts().for_viewer(self.request.user).filter(
+            author=self.current_user,
+        )
+
+    def get_count_cache_key(self):
+        if self.request.user == self.current_user:
+            return f'{super().get_count_cache_key()}:own'
+        return super().get_count_cache_key()
 
     def get_context_data(self, *, object_list=None, **kwargs):
         context = super().get_context_data(object_list=None, **kwargs)
@@ -134,11 +206,13 @@ class CommentCreateView(LoginRequiredMixin, CreateView):
     template_name = 'blog/comment.html'
 
     def form_valid(self, form):
+        # Одна проверка по первичному ключу без чтения строки поста.
+        if not Post.objects.for_viewer(self.request.user).filter(
+                pk=self.kwargs['post_pk'],
+        ).exists():
+            raise Http404
         form.instance.author = self.request.user
-        form.instance.post_id = get_object_or_404(
-            Post,
-            pk=self.kwargs['post_pk']
-        ).pk
+        form.instance.post_id = self.kwargs['post_pk']
 
         return super().form_valid(form)
 
@@ -0,0 +1,193 @@
+"""Бэкенд кеша Django для серверов с протоколом Redis (RESP).
+
+Клиент не требует внешних библиотек и использует только команды,
+которые есть и у Redis, и у совместимых с ним серверов::
+
+    CACHES = {
+        'pages': {
+            'BACKEND': 'blogicum.cache_backends.RespCache',
+            'LOCATION': 'redis://127.0.0.1:6379/0',
+        },
+    }
+
+Целые числа хранятся как есть, чтобы работал INCRBY, остальные
+значения сериализуются через pickle.
+"""
+import pickle
+import socket
+import threading
+from urllib.parse import urlsplit
+
+from django.core.cache.backends.base import DEFAULT_TIMEOUT, BaseCache
+
+
+class RespError(Exception):
+    pass
+
+
+class RespConnection:
+    """Одно соединение с сервером: запрос и разбор ответа."""
+
+    def __init__(self, address, db=0, timeout=None):
+        self.sock = socket.create_connection(address, timeout=timeout)
+        self.file = self.sock.makefile('rb')
+        if db:
+            self.execute('SELECT', db)
+
+    def execute(self, *args):
+        parts = [b'*%d\r\n' % len(args)]
+        for arg in args:
+            if not isinstance(arg, bytes):
+                arg = str(arg).encode()
+            parts.append(b'$%d\r\n%s\r\n' % (len(arg), arg))
+        self.sock.sendall(b''.join(parts))
+        return self.read()
+
+    def read(self):
+        line = self.file.readline()
+        if not line.endswith(b'\r\n'):
+            raise ConnectionError('Сервер кеша закрыл соединение.')
+        kind, rest = line[:1], line[1:-2]
+        if kind == b'+':
+            return rest.decode()
+        if kind == b'-':
+            raise RespError(rest.decode())
+        if kind == b':':
+            return int(rest)
+        if kind == b'$':
+            length = int(rest)
+            if length < 0:
+                return None
+            return self.file.read(length + 2)[:-2]
+        if kind == b'*':
+            count = int(rest)
+            if count < 0:
+                return None
+            return [self.read() for _ in range(count)]
+        raise RespError(f'Неизвестный ответ сервера: {line!r}')
+
+    def close(self):
+        self.file.close()
+        self.sock.close()
+
+
+class RespCache(BaseCache):
+
+    def __init__(self, server, params):
+        super().__init__(params)
+        url = urlsplit(server)
+        self._address = (url.hostname or '127.0.0.1', url.port or 6379)
+        self._db = int(url.path.strip('/') or 0)
+        self._socket_timeout = params.get('OPTIONS', {}).get(
+            'SOCKET_TIMEOUT', 1
+        )
+        self._local = threading.local()
+
+    def _execute(self, *args):
+        # Соединение живёт в потоке между запросами; после обрыва
+        # команда повторяется один раз на новом соединении.
+        for attempt in (1, 2):
+            connection = getattr(self._local, 'connection', None)
+            if connection is None:
+                connection = self._local.connection = RespConnection(
+                    self._address, self._db, self._socket_timeout
+                )
+            try:
+                return connection.execute(*args)
+            except (OSError, ConnectionError):
+                self.disconnect()
+                if attempt == 2:
+                    raise
+
+    def _key(self, key, version):
+        key = self.make_key(key, version=version)
+        self.validate_key(key)
+        return key
+
+    def _expiry(self, timeout):
+        """Время жизни в миллисекундах; None — без срока."""
+        if timeout is DEFAULT_TIMEOUT:
+            timeout = self.default_timeout
+        if timeout is None:
+            return None
+        return max(int(timeout * 1000), 0)
+
+    @staticmethod
+    def _encode(value):
+        if isinstance(value, int) and not isinstance(value, bool):
+            return str(value).encode()
+        return pickle.dumps(value, pickle.HIGHEST_PROTOCOL)
+
+    @staticmethod
+    def _decode(value):
+        # Вывод pickle начинается с байта PROTO, число — с цифры или минуса.
+        if value[:1] == b'\x80':
+            return pickle.loads(value)
+        return int(value)
+
+    def _set(self, key, value, timeout, *flags):
+        expiry = self._expiry(timeout)
+        if expiry == 0:
+            self._execute('DEL', key)
+            return False
+        args = ['SET', key, self._encode(value), *flags]
+        if expiry is not None:
+            args += ['PX', expiry]
+        return self._execute(*args) == 'OK'
+
+    def add(self, key, value, timeout=DEFAULT_TIMEOUT, version=None):
+        return self._set(self._key(key, version), value, timeout, 'NX')
+
+    def get(self, key, default=None, version=None):
+        value = self._execute('GET', self._key(key, version))
+        return default if value is None else self._decode(value)
+
+    def set(self, key, value, timeout=DEFAULT_TIMEOUT, version=None):
+        self._set(self._key(key, version), value, timeout)
+
+    def touch(self, key, timeout=DEFAULT_TIMEOUT, version=None):
+        key = self._key(key, version)
+        expiry = self._expiry(timeout)
+        if expiry is None:
+            return bool(self._execute('EXISTS', key))
+        if expiry == 0:
+            return bool(self._execute('DEL', key))
+        return bool(self._execute('PEXPIRE', key, expiry))
+
+    def delete(self, key, version=None):
+        return bool(self._execute('DEL', self._key(key, version)))
+
+    def has_key(self, key, version=None):
+        return bool(self._execute('EXISTS', self._key(key, version)))
+
+    def incr(self, key, delta=1, version=None):
+        key = self._key(key, version)
+        if not self._execute('EXISTS', key):
+            raise ValueError(f"Key '{key}' not found")
+        return self._execute('INCRBY', key, delta)
+
+    def get_many(self, keys, version=None):
+        keys = list(keys)
+        if not keys:
+            return {}
+        values = self._execute(
+            'MGET', *(self._key(key, version) for key in keys)
+        )
+        return {
+            key: self._decode(value)
+            for key, value in zip(keys, values) if value is not None
+        }
+
+    def clear(self):
+        self._execute('FLUSHDB')
+
+    def close(self, **kwargs):
+        # Django закрывает кеши после каждого запроса; соединение с
+        # сервером дешевле держать открытым.
+        pass
+
+    def disconnect(self):
+        connection = getattr(self._local, 'connection', None)
+        if connection is not None:
+            self._local.connection = None
+            connection.close()
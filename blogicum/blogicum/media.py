@@ -0,0 +1,172 @@
+"""Отдача загруженных файлов из MEDIA_ROOT.
+
+Файл отдаётся через FileResponse: сервер приложений с
+``wsgi.file_wrapper`` (gunicorn) пишет его в сокет через sendfile(),
+минуя память воркера. Поддерживаются запросы одного диапазона байт
+(Range, If-Range), If-None-Match и If-Modified-Since. Файлы с именем из
+SHA-256 никогда не меняются и кешируются браузером навсегда.
+
+С ``MEDIA_SENDFILE`` Django только проверяет путь и условные заголовки,
+а сам файл отдаёт веб-сервер::
+
+    MEDIA_SENDFILE = 'x-accel-redirect'  # nginx: location internal
+    MEDIA_SENDFILE = 'x-sendfile'        # Apache mod_xsendfile, lighttpd
+"""
+import mimetypes
+import os
+import re
+import stat
+from urllib.parse import quote
+
+from django.conf import settings
+from django.core.exceptions import SuspiciousFileOperation
+from django.http import FileResponse, Http404, HttpResponse
+from django.utils._os import safe_join
+from django.utils.cache import get_conditional_response
+from django.utils.http import http_date, quote_etag
+from django.views.decorators.http import require_safe
+
+from blog.storage import digest_from_name, is_blob_name
+
+IMMUTABLE = 'public, max-age=31536000, immutable'
+RANGE_RE = re.compile(r'^bytes=(\d*)-(\d*)$')
+
+
+class FileRange:
+    """Часть файла для FileResponse: читает не больше length байт.
+
+    Без fileno(): file_wrapper сервера отдал бы файл до конца.
+    """
+
+    def __init__(self, file, start, length):
+        file.seek(start)
+        self.file = file
+        self.remaining = length
+
+    def read(self, size=-1):
+        if size < 0 or size > self.remaining:
+            size = self.remaining
+        data = self.file.read(size)
+        self.remaining -= len(data)
+        return data
+
+    def close(self):
+        self.file.close()
+
+
+def is_immutable(name):
+    """Оригинал в хранилище по содержимому: имя — это хеш файла.
+
+    Копии картинок можно пересобрать с другим качеством, поэтому они
+    кешируются на обычный срок.
+    """
+    digest = digest_from_name(name)
+    return bool(digest) and is_blob_name(name) and (
+        os.path.splitext(os.path.basename(name))[0] == digest
+    )
+
+
+def parse_range(header, size):
+    """(начало, длина) для одного диапазона, None — отдать файл целиком.
+
+    Несколько диапазонов сразу не поддерживаются, и по RFC 9110 на них
+    можно ответить всем файлом. ValueError — диапазон вне файла.
+    """
+    match = RANGE_RE.match(header.replace(' ', ''))
+    if not match or match.groups() == ('', ''):
+        return None
+    first, last = match.groups()
+    if not first:
+        length = min(int(last), size)
+        if not length:
+            raise ValueError(header)
+        return size - length, length
+    start = int(first)
+    end = min(int(last), size - 1) if last else size - 1
+    if start >= size or end < start:
+        raise ValueError(header)
+    return start, end - start + 1
+
+
+def sendfile_response(path, full_path):
+    if settings.MEDIA_SENDFILE == 'x-accel-redirect':
+        response = HttpResponse()
+        response['X-Accel-Redirect'] = (
+            settings.MEDIA_ACCEL_PREFIX + quote(path)
+        )
+    elif settings.MEDIA_SENDFILE == 'x-sendfile':
+        response = HttpResponse()
+        response['X-Sendfile'] = full_path
+    else:
+        raise ValueError(
+            f'Неизвестный MEDIA_SENDFILE: {settings.MEDIA_SENDFILE!r}'
+        )
+    # Тип и диапазоны выставит веб-сервер.
+    del response['Content-Type']
+    return response
+
+
+def file_response(request, full_path, size, etag):
+    content_type = (
+        mimetypes.guess_type(full_path)[0] or 'application/octet-stream'
+    )
+    header = request.headers.get('Range')
+    if_range = request.headers.get('If-Range')
+    if header and (not if_range or if_range == etag):
+        try:
+            part = parse_range(header, size)
+        except ValueError:
+            response = HttpResponse(status=416)
+            response['Content-Range'] = f'bytes */{size}'
+            return response
+        if part is not None:
+            start, length = part
+            response = FileResponse(
+                FileRange(open(full_path, 'rb'), start, length),
+                status=206,
+                content_type=content_type,
+            )
+            response['Content-Length'] = length
+            response['Content-Range'] = (
+                f'bytes {start}-{start + length - 1}/{size}'
+            )
+            return response
+    return FileResponse(open(full_path, 'rb'), content_type=content_type)
+
+
+@require_safe
+def serve(request, path):
+    """Файл из MEDIA_ROOT по пути из адреса."""
+    try:
+        full_path = safe_join(settings.MEDIA_ROOT, path)
+        status = os.stat(full_path)
+    except (SuspiciousFileOperation, OSError, ValueError):
+        raise Http404('Файл не найден.')
+    if not stat.S_ISREG(status.st_mode):
+        raise Http404('Файл не найден.')
+    immutable = is_immutable(path)
+    # Время изменения блоба обновляется при повторной загрузке, а
+    # содержимое нет, поэтому его ETag — хеш из имени.
+    etag = quote_etag(
+        digest_from_name(path) if immutable
+        else f'{status.st_size:x}-{status.st_mtime_ns:x}'
+    )
+    last_modified = int(status.st_mtime)
+    response = get_conditional_response(
+        request, etag=etag, last_modified=last_modified
+    )
+    if response is None:
+        if settings.MEDIA_SENDFILE:
+            response = sendfile_response(path, full_path)
+        else:
+            response = file_response(
+                request, full_path, status.st_size, etag
+            )
+            response['Accept-Ranges'] = 'bytes'
+    response['ETag'] = etag
+    response['Last-Modified'] = http_date(last_modified)
+    response['Cache-Control'] = (
+        IMMUTABLE if immutable
+        else f'public, max-age={settings.MEDIA_MAX_AGE}'
+    )
+    return response
@@ -0,0 +1,72 @@
+"""Чтение из реплик для публичных страниц ленты и публикаций.
+
+Представление соглашается читать из реплики атрибутом
+``read_replica = True``. Запись всегда идёт в ``default``; после
+изменяющего запроса пользователь на ``REPLICA_PIN_SECONDS`` секунд
+закрепляется за основной базой, чтобы сразу увидеть свои изменения.
+"""
+import random
+from contextvars import ContextVar
+
+from django.conf import settings
+from django.db import DEFAULT_DB_ALIAS, connections
+
+PIN_COOKIE = 'pin_primary'
+
+_replica_allowed = ContextVar('replica_allowed', default=False)
+
+
+class ReplicaRouter:
+
+    def db_for_read(self, model, **hints):
+        if (
+                not settings.DATABASE_REPLICAS
+                or not _replica_allowed.get()
+                or connections[DEFAULT_DB_ALIAS].in_atomic_block
+        ):
+            return DEFAULT_DB_ALIAS
+        return random.choice(settings.DATABASE_REPLICAS)
+
+    def db_for_write(self, model, **hints):
+        return DEFAULT_DB_ALIAS
+
+    def allow_relation(self, obj1, obj2, **hints):
+        pool = {DEFAULT_DB_ALIAS, *settings.DATABASE_REPLICAS}
+        if obj1._state.db in pool and obj2._state.db in pool:
+            return True
+        return None
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        return db == DEFAULT_DB_ALIAS
+
+
+class ReplicaMiddleware:
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        token = _replica_allowed.set(False)
+        try:
+            response = self.get_response(request)
+        finally:
+            _replica_allowed.reset(token)
+        if (
+                request.method not in ('GET', 'HEAD', 'OPTIONS')
+                and response.status_code < 400
+        ):
+            response.set_cookie(
+                PIN_COOKIE, '1',
+                max_age=settings.REPLICA_PIN_SECONDS,
+                httponly=True,
+                samesite='Lax',
+            )
+        return response
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        view_class = getattr(view_func, 'view_class', None)
+        _replica_allowed.set(
+            request.method in ('GET', 'HEAD')
+            and getattr(view_class, 'read_replica', False)
+            and PIN_COOKIE not in request.COOKIES
+        )
@@ -33,6 +33,7 @@ MIDDLEWARE = [
     'django.contrib.auth.middleware.AuthenticationMiddleware',
     'django.contrib.messages.middleware.MessageMiddleware',
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
+    'blogicum.replicas.ReplicaMiddleware',
 ]
 
 ROOT_URLCONF = 'blogicum.urls'
@@ -55,14 +56,97 @@ TEMPLATES = [
     },
 ]
 
+# Разбирать шаблоны при старте процесса; имеет смысл только вместе с
+# кешируемым загрузчиком, см. blogicum/settings_production.py.
+TEMPLATE_WARMUP = False
+
 WSGI_APPLICATION = 'blogicum.wsgi.application'
 
 DATABASES = {
     'default': {
         'ENGINE': 'django.db.backends.sqlite3',
         'NAME': BASE_DIR / 'db.sqlite3',
+        'CONN_MAX_AGE': 60,
+        'OPTIONS': {
+            'timeout': 5,
+        },
+    }
+}
+
+# Выполняются на каждом новом SQLite-соединении: WAL позволяет читать
+# ленту, пока идёт запись комментариев.
+SQLITE_PRAGMAS = {
+    'journal_mode': 'wal',
+    'synchronous': 'normal',
+    'mmap_size': 128 * 1024 * 1024,
+    'cache_size': -20000,
+    'busy_timeout': 5000,
+}
+
+# Реплики для чтения ленты и публикаций, например
+# BLOGICUM_DB_REPLICAS=replica1,replica2. Локально это копии SQLite-файла,
+# которые обновляет команда sync_replicas.
+DATABASE_REPLICAS = [
+    alias for alias in os.getenv('BLOGICUM_DB_REPLICAS', '').split(',')
+    if alias
+]
+for alias in DATABASE_REPLICAS:
+    DATABASES[alias] = {
+        **DATABASES['default'],
+        'NAME': BASE_DIR / f'db-{alias}.sqlite3',
+        'TEST': {'MIRROR': 'default'},
     }
+
+DATABASE_ROUTERS = ['blogicum.replicas.ReplicaRouter']
+
+# Сколько секунд после записи читать только из основной базы.
+REPLICA_PIN_SECONDS = 5
+
+# Хранилище кеша страниц для анонимных читателей задаёт
+# BLOGICUM_PAGE_CACHE: locmem (по умолчанию), file или адрес redis://.
+PAGE_CACHE_BACKENDS = {
+    'locmem': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        'LOCATION': 'pages',
+    },
+    'file': {
+        'BACKEND': 'django.core.cache.backends.filebased.FileBasedCache',
+        'LOCATION': BASE_DIR / 'page_cache',
+    },
+}
+_page_cache = os.getenv('BLOGICUM_PAGE_CACHE', 'locmem')
+# Кеш по умолчанию (версия ленты, число постов) так же задаёт
+# BLOGICUM_CACHE. Команде publish_scheduled нужны общие с веб-процессами
+# кеш по умолчанию и кеш страниц, иначе сброс останется в её памяти.
+DEFAULT_CACHE_BACKENDS = {
+    'locmem': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+    },
+    'file': {
+        'BACKEND': 'django.core.cache.backends.filebased.FileBasedCache',
+        'LOCATION': BASE_DIR / 'cache',
+    },
+}
+_default_cache = os.getenv('BLOGICUM_CACHE', 'locmem')
+CACHES = {
+    'default': DEFAULT_CACHE_BACKENDS.get(_default_cache) or {
+        'BACKEND': 'blogicum.cache_backends.RespCache',
+        'LOCATION': _default_cache,
+    },
+    'pages': PAGE_CACHE_BACKENDS.get(_page_cache) or {
+        'BACKEND': 'blogicum.cache_backends.RespCache',
+        'LOCATION': _page_cache,
+    },
+    # Отрендеренные карточки публикаций для тега {% cache %}.
+    'template_fragments': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        'LOCATION': 'template_fragments',
+        'OPTIONS': {'MAX_ENTRIES': 5000},
+    },
 }
+PAGE_CACHE = 'pages'
+# Страница живёт в кеше не дольше этого, даже если событий не было.
+PAGE_CACHE_TIMEOUT = 60
 
 AUTH_PASSWORD_VALIDATORS = [
     {
@@ -97,6 +181,34 @@ STATICFILES_DIRS = [
 
 MEDIA_ROOT = os.path.join(BASE_DIR, 'media')
 MEDIA_URL = '/media/'
+# Одинаковые загрузки хранятся одним файлом с именем из SHA-256.
+DEFAULT_FILE_STORAGE = 'blog.storage.ContentAddressedStorage'
+# Сколько секунд collect_media не трогает свежие файлы без ссылок:
+# пост с только что загруженной картинкой может быть ещё не сохранён.
+MEDIA_GC_GRACE = 3600
+# Кто отдаёт медиафайлы: None — Django через FileResponse,
+# 'x-accel-redirect' — nginx, 'x-sendfile' — Apache или lighttpd.
+MEDIA_SENDFILE = os.getenv('BLOGICUM_MEDIA_SENDFILE') or None
+# internal-location nginx с alias на MEDIA_ROOT.
+MEDIA_ACCEL_PREFIX = '/protected-media/'
+# Срок кеширования в браузере для файлов, имя которых не хеш.
+MEDIA_MAX_AGE = 60 * 60
+
+# Ширины копий картинок публикаций для srcset и качество кодирования.
+POST_IMAGE_WIDTHS = (320, 640, 1280)
+POST_IMAGE_QUALITY = 80
+# Процессов для кодирования копий; None — по числу ядер.
+POST_IMAGE_WORKERS = None
+# Предел объёма загружаемой картинки в байтах и качество, с которым
+# она перекодируется без EXIF.
+POST_IMAGE_MAX_SIZE = 10 * 1024 * 1024
+POST_UPLOAD_QUALITY = 90
+
+FILE_UPLOAD_HANDLERS = [
+    'blog.uploads.ImageUploadHandler',
+    'django.core.files.uploadhandler.MemoryFileUploadHandler',
+    'django.core.files.uploadhandler.TemporaryFileUploadHandler',
+]
 
 EMAIL_BACKEND = 'django.core.mail.backends.filebased.EmailBackend'
 EMAIL_FILE_PATH = BASE_DIR / 'sent_emails'
@@ -105,6 +217,14 @@ DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
 
 MAX_LENGTH = 256
 
+# Сколько секунд хранить число публикаций для нумерованной пагинации.
+FEED_COUNT_CACHE_TIMEOUT = 300
+# Выше этого числа публикации не считаются: показывается «много страниц».
+FEED_COUNT_LIMIT = 10000
+
+# Сколько секунд процесс помнит опубликованные категории по slug.
+CATEGORY_CACHE_TIMEOUT = 300
+
 CSRF_FAILURE_VIEW = 'pages.views.permission_denied'
 
 LOGIN_REDIRECT_URL = 'blog:index'
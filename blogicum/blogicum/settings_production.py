@@ -0,0 +1,33 @@
+"""Настройки для боевого запуска.
+
+    DJANGO_SETTINGS_MODULE=blogicum.settings_production \
+    BLOGICUM_SECRET_KEY=... BLOGICUM_ALLOWED_HOSTS=blogicum.example \
+    gunicorn blogicum.wsgi
+"""
+import os
+
+from blogicum.settings import *  # noqa: F401, F403
+from blogicum.settings import TEMPLATES
+
+DEBUG = False
+
+SECRET_KEY = os.environ['BLOGICUM_SECRET_KEY']
+
+ALLOWED_HOSTS = os.getenv('BLOGICUM_ALLOWED_HOSTS', '').split(',')
+
+# Шаблоны читаются и разбираются один раз за время жизни процесса.
+TEMPLATES = [{
+    **TEMPLATES[0],
+    'APP_DIRS': False,
+    'OPTIONS': {
+        **TEMPLATES[0]['OPTIONS'],
+        'loaders': [
+            ('django.template.loaders.cached.Loader', [
+                'django.template.loaders.filesystem.Loader',
+                'django.template.loaders.app_directories.Loader',
+            ]),
+        ],
+    },
+}]
+
+TEMPLATE_WARMUP = True
@@ -0,0 +1,41 @@
+"""Разбор шаблонов проекта до первого запроса.
+
+Кешируемый загрузчик хранит разобранные шаблоны в памяти процесса.
+warm_templates() заполняет этот кеш сразу при старте воркера, чтобы
+первый запрос после выкладки не тратил время на чтение и разбор.
+"""
+from pathlib import Path
+
+from django.template import engines
+from django.template.backends.django import DjangoTemplates
+from django.template.loaders.cached import Loader as CachedLoader
+
+
+def uses_cached_loader(engine):
+    return any(
+        isinstance(loader, CachedLoader)
+        for loader in engine.engine.template_loaders
+    )
+
+
+def template_names(engine):
+    """Имена всех шаблонов из DIRS движка, например ``blog/index.html``."""
+    for directory in map(Path, engine.engine.dirs):
+        for path in sorted(directory.rglob('*.html')):
+            yield path.relative_to(directory).as_posix()
+
+
+def warm_templates(engine=None):
+    """Разбирает шаблоны из DIRS и возвращает их имена.
+
+    Без кешируемого загрузчика результат разбора не сохраняется, но
+    синтаксические ошибки всё равно обнаруживаются.
+    """
+    warmed = []
+    for engine in [engine] if engine else engines.all():
+        if not isinstance(engine, DjangoTemplates):
+            continue
+        for name in template_names(engine):
+            engine.get_template(name)
+            warmed.append(name)
+    return warmed
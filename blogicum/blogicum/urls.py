@@ -1,10 +1,9 @@
-from django.conf.urls.static import static
 from django.contrib import admin
 from django.contrib.auth.forms import UserCreationForm
-from django.urls import include, path, reverse_lazy
+from django.urls import include, path, re_path, reverse_lazy
 from django.views.generic import CreateView
 
-from blogicum import settings
+from blogicum import media, settings
 
 urlpatterns = [
     path('admin/', admin.site.urls),
@@ -17,12 +16,10 @@ urlpatterns = [
          name='registration',
          ),
     path('auth/', include('django.contrib.auth.urls')),
+    re_path(rf'^{settings.MEDIA_URL.lstrip("/")}(?P<path>.+)$',
+            media.serve, name='media'),
     path('', include('blog.urls', namespace='blog')),
 ]
 
-if settings.DEBUG:
-    urlpatterns += static(settings.MEDIA_URL,
-                          document_root=settings.MEDIA_ROOT)
-
 handler404 = 'pages.views.page_not_found'
 handler500 = 'pages.views.server_error'
@@ -1,3 +1,4 @@
+import json
 import os
 import re
 import time
@@ -24,6 +25,7 @@ from django.forms import BaseForm
 from django.http import HttpResponse
 from django.test import override_settings
 from django.test.client import Client
+from django.utils.http import urlsafe_base64_encode
 from mixer.backend.django import mixer as _mixer
 
 N_PER_FIXTURE = 3
@@ -35,6 +37,11 @@ UrlRepr = NamedTuple("UrlRepr", [("url", str), ("repr", str)])
 TitledUrlRepr = TypeVar("TitledUrlRepr", bound=Tuple[UrlRepr, str])
 
 
+def make_cursor(position):
+    """Курсор страницы с произвольной позицией [значение, id]."""
+    return urlsafe_base64_encode(json.dumps(position).encode())
+
+
 @pytest.fixture(autouse=True)
 def enable_debug_false():
     with override_settings(DEBUG=False):
@@ -363,6 +370,7 @@ def cleanup(request):
                     filename.endswith(".jpg")
                     or filename.endswith(".gif")
                     or filename.endswith(".png")
+                    or filename.endswith(".webp")
             ):
                 file_path = os.path.join(root, filename)
                 if os.path.getmtime(file_path) >= start_time:
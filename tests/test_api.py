@@ -0,0 +1,132 @@
+from datetime import timedelta
+
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+
+from conftest import make_cursor
+
+pytestmark = [pytest.mark.django_db]
+
+
+@pytest.fixture(autouse=True)
+def media_root(settings, tmp_path):
+    settings.MEDIA_ROOT = tmp_path
+
+
+@pytest.fixture
+def posts(mixer, user, published_category, published_location):
+    now = timezone.now()
+    return mixer.cycle(5).blend(
+        "blog.Post",
+        author=user,
+        category=published_category,
+        location=published_location,
+        is_published=True,
+        pub_date=(now - timedelta(hours=hours) for hours in range(1, 6)),
+    )
+
+
+@pytest.fixture
+def hidden_post(mixer, user, published_category):
+    return mixer.blend(
+        "blog.Post",
+        author=user,
+        category=published_category,
+        pub_date=timezone.now() + timedelta(days=1),
+    )
+
+
+def test_post_list_pages_by_cursor(client, posts, hidden_post):
+    response = client.get("/api/v1/posts/", {"page_size": 2})
+    assert response.status_code == 200
+    data = response.json()
+    assert [item["id"] for item in data["results"]] == [
+        posts[0].id, posts[1].id
+    ], "Убедитесь, что API отдаёт только опубликованные посты по дате."
+    assert data["previous"] is None
+    seen = [item["id"] for item in data["results"]]
+    while data["next"]:
+        data = client.get(data["next"]).json()
+        seen += [item["id"] for item in data["results"]]
+    assert seen == [post.id for post in posts]
+    assert hidden_post.id not in seen
+
+    previous = client.get(data["previous"]).json()
+    assert [item["id"] for item in previous["results"]] == [
+        posts[2].id, posts[3].id
+    ]
+
+
+def test_sparse_fields_select_only_requested_columns(client, posts):
+    with CaptureQueriesContext(connection) as queries:
+        response = client.get("/api/v1/posts/", {"fields": "id,title"})
+    assert response.json()["results"][0] == {
+        "id": posts[0].id, "title": posts[0].title,
+    }
+    sql = queries.captured_queries[-1]["sql"]
+    assert '"blog_post"."text"' not in sql, (
+        "Убедитесь, что ?fields= оставляет в запросе только нужные столбцы."
+    )
+    assert client.get(
+        "/api/v1/posts/", {"fields": "id,password"}
+    ).status_code == 400
+
+
+def test_post_detail_follows_visibility(client, user_client, posts,
+                                        hidden_post):
+    data = client.get(f"/api/v1/posts/{posts[0].id}/").json()
+    assert data["author"] == posts[0].author.username
+    assert data["category"] == posts[0].category.slug
+    assert data["location"] == posts[0].location.name
+    assert data["image"] == posts[0].image.url
+    url = f"/api/v1/posts/{hidden_post.id}/"
+    assert client.get(url).status_code == 404
+    assert user_client.get(url).status_code == 200, (
+        "Убедитесь, что автор видит в API свои отложенные публикации."
+    )
+
+
+def test_category_posts(client, posts, another_category):
+    slug = posts[0].category.slug
+    data = client.get(f"/api/v1/categories/{slug}/posts/").json()
+    assert len(data["results"]) == len(posts)
+    another_category.is_published = False
+    another_category.save()
+    response = client.get(
+        f"/api/v1/categories/{another_category.slug}/posts/"
+    )
+    assert response.status_code == 404
+    assert "detail" in response.json()
+
+
+def test_comments(client, mixer, posts, hidden_post):
+    post = posts[0]
+    comments = mixer.cycle(3).blend(
+        "blog.Comment", post=post, author=post.author
+    )
+    data = client.get(
+        f"/api/v1/posts/{post.id}/comments/", {"page_size": 2}
+    ).json()
+    assert [item["id"] for item in data["results"]] == [
+        comments[0].id, comments[1].id
+    ]
+    assert set(data["results"][0]) == {"id", "text", "created_at", "author"}
+    assert client.get(
+        f"/api/v1/posts/{hidden_post.id}/comments/"
+    ).status_code == 404
+    assert client.get(
+        f"/api/v1/posts/{post.id}/comments/", {"after": "garbage"}
+    ).status_code == 400
+
+
+@pytest.mark.parametrize("position", [
+    [1.0, 1], [True, 1], ["2020-01-01T00:00:00", None],
+])
+def test_cursor_of_wrong_type(client, posts, position):
+    response = client.get("/api/v1/posts/", {"after": make_cursor(position)})
+    assert response.status_code == 400, (
+        "Убедитесь, что курсор с позицией не того типа даёт ошибку 400."
+    )
+    assert "detail" in response.json()
@@ -0,0 +1,39 @@
+from http import HTTPStatus
+
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+pytestmark = [pytest.mark.django_db]
+
+
+def test_category_is_read_from_process_cache(
+        user_client, post_with_published_location
+):
+    url = f"/category/{post_with_published_location.category.slug}/"
+    user_client.get(url)
+    with CaptureQueriesContext(connection) as queries:
+        response = user_client.get(url)
+    assert response.status_code == HTTPStatus.OK
+    sql = [query["sql"] for query in queries]
+    assert not any('FROM "blog_category"' in query for query in sql), (
+        "Убедитесь, что категория по slug берётся из кеша процесса."
+    )
+    post_queries = [query for query in sql if 'FROM "blog_post"' in query]
+    assert post_queries
+    assert not any('"blog_category"' in query for query in post_queries), (
+        "Убедитесь, что посты опубликованной категории выбираются по"
+        " category_id без присоединения таблицы категорий."
+    )
+    assert post_with_published_location.title in response.content.decode()
+
+
+def test_unpublished_category_is_hidden_at_once(
+        user_client, post_with_published_location
+):
+    category = post_with_published_location.category
+    url = f"/category/{category.slug}/"
+    assert user_client.get(url).status_code == HTTPStatus.OK
+    category.is_published = False
+    category.save()
+    assert user_client.get(url).status_code == HTTPStatus.NOT_FOUND
@@ -0,0 +1,38 @@
+import pytest
+from django.core.management import call_command
+
+from blog.models import Comment, Post
+
+pytestmark = [pytest.mark.django_db]
+
+
+def test_comment_count_follows_comments(
+        mixer, post_with_published_location, another_user
+):
+    post = post_with_published_location
+    comments = mixer.cycle(3).blend(Comment, post=post)
+    own_comment = mixer.blend(Comment, post=post, author=another_user)
+    post.refresh_from_db()
+    assert post.comment_count == 4, (
+        "Убедитесь, что при создании комментария счётчик поста увеличивается."
+    )
+
+    comments[0].delete()
+    another_user.delete()
+    post.refresh_from_db()
+    assert not Comment.objects.filter(pk=own_comment.pk).exists()
+    assert post.comment_count == 2, (
+        "Убедитесь, что счётчик уменьшается при удалении комментария, в том"
+        " числе каскадном."
+    )
+
+
+def test_recount_comments_repairs_drift(mixer, post_with_published_location):
+    post = post_with_published_location
+    mixer.cycle(2).blend(Comment, post=post)
+    Post.objects.filter(pk=post.pk).update(comment_count=7)
+
+    call_command("recount_comments", batch_size=1)
+
+    post.refresh_from_db()
+    assert post.comment_count == 2
@@ -0,0 +1,70 @@
+from datetime import timedelta
+from http import HTTPStatus
+
+import pytest
+from django.utils import timezone
+
+from blog.models import Comment
+
+pytestmark = [pytest.mark.django_db]
+
+
+@pytest.fixture
+def many_comments(mixer, post_with_published_location):
+    comments = mixer.cycle(25).blend(
+        Comment, post=post_with_published_location
+    )
+    start = timezone.now() - timedelta(days=1)
+    for i, comment in enumerate(comments):
+        Comment.objects.filter(pk=comment.pk).update(
+            created_at=start + timedelta(minutes=i)
+        )
+    return comments
+
+
+def test_comments_load_in_batches(
+        unlogged_client, post_with_published_location, many_comments
+):
+    post = post_with_published_location
+    response = unlogged_client.get(f"/posts/{post.id}/")
+    page = response.context["comments"]
+    seen = [comment.id for comment in page]
+    assert len(seen) == 10, (
+        "Убедитесь, что на странице публикации сразу выводится только первая"
+        " порция комментариев."
+    )
+    while page.has_next():
+        response = unlogged_client.get(
+            f"/posts/{post.id}/comments/?after={page.next_cursor}"
+        )
+        assert response.status_code == HTTPStatus.OK
+        assert "<html" not in response.content.decode("utf-8")
+        page = response.context["comments"]
+        seen.extend(comment.id for comment in page)
+    assert seen == [comment.id for comment in many_comments]
+
+
+def test_comments_of_hidden_post_are_hidden(
+        unlogged_client, post_with_published_location, many_comments
+):
+    post = post_with_published_location
+    post.is_published = False
+    post.save()
+    response = unlogged_client.get(f"/posts/{post.id}/comments/")
+    assert response.status_code == HTTPStatus.NOT_FOUND
+
+
+def test_cannot_comment_hidden_post(
+        user_client, another_user_client, post_with_published_location
+):
+    post = post_with_published_location
+    post.is_published = False
+    post.save()
+    url = f"/posts/{post.id}/comment/"
+    response = another_user_client.post(url, data={"text": "Текст"})
+    assert response.status_code == HTTPStatus.NOT_FOUND, (
+        "Убедитесь, что нельзя оставить комментарий к скрытой публикации."
+    )
+    response = user_client.post(url, data={"text": "Текст"})
+    assert response.status_code == HTTPStatus.FOUND
+    assert Comment.objects.filter(post=post).count() == 1
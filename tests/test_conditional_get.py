@@ -0,0 +1,69 @@
+import time
+from http import HTTPStatus
+
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+pytestmark = [pytest.mark.django_db]
+
+
+def test_detail_not_modified(
+        user_client, another_user_client, mixer, post_with_published_location
+):
+    post = post_with_published_location
+    url = f"/posts/{post.id}/"
+    response = user_client.get(url)
+    etag = response["ETag"]
+    assert response.has_header("Last-Modified")
+
+    with CaptureQueriesContext(connection) as queries:
+        response = user_client.get(url, HTTP_IF_NONE_MATCH=etag)
+    assert response.status_code == HTTPStatus.NOT_MODIFIED, (
+        "Убедитесь, что страница публикации отвечает 304 на запрос с"
+        " актуальным ETag."
+    )
+    assert not any(
+        'FROM "blog_comment"' in query["sql"] for query in queries
+    ), "Убедитесь, что ответ 304 не выбирает комментарии."
+
+    assert another_user_client.get(url)["ETag"] != etag
+    mixer.blend("blog.Comment", post=post, author=post.author)
+    response = user_client.get(url, HTTP_IF_NONE_MATCH=etag)
+    assert response.status_code == HTTPStatus.OK, (
+        "Убедитесь, что новый комментарий меняет ETag публикации."
+    )
+
+
+def test_feed_not_modified_without_queries(
+        client, post_with_published_location
+):
+    etag = client.get("/")["ETag"]
+    with CaptureQueriesContext(connection) as queries:
+        response = client.get("/", HTTP_IF_NONE_MATCH=etag)
+    assert response.status_code == HTTPStatus.NOT_MODIFIED
+    assert not queries, (
+        "Убедитесь, что ответ 304 для ленты не обращается к базе."
+    )
+
+    post_with_published_location.title = "Новый заголовок"
+    post_with_published_location.save()
+    response = client.get("/", HTTP_IF_NONE_MATCH=etag)
+    assert response.status_code == HTTPStatus.OK
+    assert response["ETag"] != etag
+
+
+def test_cached_page_gets_current_etag(
+        client, post_with_published_location, monkeypatch, settings
+):
+    assert client.get("/")["X-Page-Cache"] == "miss"
+    # Начало следующего интервала ETag, пока страница ещё в кеше.
+    period = settings.PAGE_CACHE_TIMEOUT
+    later = (time.time() // period + 1) * period
+    monkeypatch.setattr(time, "time", lambda: later)
+    response = client.get("/")
+    assert response["X-Page-Cache"] == "hit"
+    response = client.get("/", HTTP_IF_NONE_MATCH=response["ETag"])
+    assert response.status_code == HTTPStatus.NOT_MODIFIED, (
+        "Убедитесь, что страница из кеша отдаётся с текущим ETag."
+    )
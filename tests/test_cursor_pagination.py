@@ -0,0 +1,69 @@
+from datetime import timedelta
+from http import HTTPStatus
+
+import pytest
+from django.utils import timezone
+
+from conftest import N_PER_PAGE, make_cursor
+
+pytestmark = [pytest.mark.django_db]
+
+
+@pytest.fixture
+def past_posts(mixer, user, published_category):
+    now = timezone.now()
+    return mixer.cycle(N_PER_PAGE * 2 + 5).blend(
+        "blog.Post",
+        author=user,
+        category=published_category,
+        location=None,
+        pub_date=(now - timedelta(hours=i) for i in range(100)),
+    )
+
+
+def test_cursor_walks_whole_feed(user_client, past_posts):
+    response = user_client.get("/")
+    assert response.status_code == HTTPStatus.OK
+    page = response.context["page_obj"]
+    seen = [post.id for post in page]
+    pages = 1
+    while page.has_next():
+        response = user_client.get(f"/?after={page.next_cursor}")
+        assert response.status_code == HTTPStatus.OK
+        page = response.context["page_obj"]
+        seen.extend(post.id for post in page)
+        pages += 1
+    expected = [
+        post.id for post in sorted(
+            past_posts, key=lambda post: post.pub_date, reverse=True
+        )
+    ]
+    assert seen == expected, (
+        "Убедитесь, что курсорная пагинация проходит ленту без пропусков и"
+        " повторов, от новых публикаций к старым."
+    )
+    assert pages == 3
+
+    response = user_client.get(f"/?before={page.previous_cursor}")
+    previous_ids = [post.id for post in response.context["page_obj"]]
+    assert previous_ids == expected[N_PER_PAGE:N_PER_PAGE * 2]
+
+
+def test_legacy_page_links_and_bad_cursor(user_client, past_posts):
+    response = user_client.get("/?page=2")
+    assert response.status_code == HTTPStatus.OK
+    assert response.context["page_obj"].number == 2
+    assert len(response.context["page_obj"]) == N_PER_PAGE
+
+    response = user_client.get("/?after=garbage")
+    assert response.status_code == HTTPStatus.NOT_FOUND
+
+
+@pytest.mark.parametrize("position", [
+    [1.0, 1], [True, 1], ["2020-01-01T00:00:00", "1"], [None, 1],
+])
+def test_cursor_of_wrong_type(user_client, past_posts, position):
+    response = user_client.get("/", {"after": make_cursor(position)})
+    assert response.status_code == HTTPStatus.NOT_FOUND, (
+        "Убедитесь, что курсор с позицией не того типа отклоняется."
+    )
@@ -0,0 +1,85 @@
+from datetime import timedelta
+
+import pytest
+from django.core.cache import cache
+from django.db import connection
+from django.test import override_settings
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+
+from conftest import N_PER_PAGE
+
+pytestmark = [pytest.mark.django_db]
+
+
+@pytest.fixture(autouse=True)
+def clear_cache():
+    cache.clear()
+    yield
+    cache.clear()
+
+
+@pytest.fixture
+def past_posts(mixer, user, published_category):
+    now = timezone.now()
+    return mixer.cycle(N_PER_PAGE + 5).blend(
+        "blog.Post",
+        author=user,
+        category=published_category,
+        pub_date=(now - timedelta(hours=i) for i in range(100)),
+    )
+
+
+def count_queries(client, url):
+    with CaptureQueriesContext(connection) as queries:
+        response = client.get(url)
+    return response, [
+        query["sql"] for query in queries if "COUNT(" in query["sql"]
+    ]
+
+
+def test_count_is_cached_until_publication_changes(user_client, past_posts):
+    response, counts = count_queries(user_client, "/?page=1")
+    assert response.context["paginator"].count == len(past_posts)
+    assert counts
+
+    response, counts = count_queries(user_client, "/?page=2")
+    assert not counts, (
+        "Убедитесь, что число публикаций берётся из кеша при повторном"
+        " запросе."
+    )
+
+    past_posts[0].is_published = False
+    past_posts[0].save()
+    response, counts = count_queries(user_client, "/?page=1")
+    assert counts
+    assert response.context["paginator"].count == len(past_posts) - 1
+
+
+@override_settings(FEED_COUNT_LIMIT=N_PER_PAGE)
+def test_many_pages_without_full_count(user_client, past_posts):
+    response = user_client.get("/?page=2")
+    paginator = response.context["paginator"]
+    assert paginator.is_truncated
+    assert len(response.context["page_obj"]) == 5
+    assert not response.context["page_obj"].has_next()
+    assert user_client.get("/?page=3").status_code == 404
+
+
+def test_page_range_is_windowed(user_client, mixer, user, published_category):
+    now = timezone.now()
+    mixer.cycle(N_PER_PAGE * 12).blend(
+        "blog.Post",
+        author=user,
+        category=published_category,
+        pub_date=(now - timedelta(minutes=i) for i in range(1000)),
+    )
+    response = user_client.get("/?page=6")
+    page_range = list(response.context["page_range"])
+    assert page_range == [1, "…", 4, 5, 6, 7, 8, "…", 12], (
+        "Убедитесь, что пагинатор показывает первую, последнюю и соседние"
+        " с текущей страницы, а не все страницы ленты."
+    )
+    content = response.content.decode("utf-8")
+    assert "?page=12" in content
+    assert "?page=10" not in content
@@ -0,0 +1,120 @@
+from io import BytesIO
+
+import pytest
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.management import call_command
+from PIL import Image
+
+from blog.images import rendition_name
+from blog.models import Post
+
+pytestmark = [pytest.mark.django_db]
+
+
+@pytest.fixture(autouse=True)
+def media_root(settings, tmp_path):
+    settings.MEDIA_ROOT = tmp_path
+    settings.POST_IMAGE_WIDTHS = (320, 640, 1280)
+    return tmp_path
+
+
+def make_image(width=1000, height=600):
+    output = BytesIO()
+    Image.new("RGB", (width, height), "teal").save(output, "PNG")
+    return SimpleUploadedFile("photo.png", output.getvalue(), "image/png")
+
+
+@pytest.fixture
+def post_with_image(mixer, user, published_category):
+    return mixer.blend(
+        "blog.Post", author=user, category=published_category, image=None
+    )
+
+
+def test_worker_builds_renditions(
+        client, post_with_image, media_root,
+        django_capture_on_commit_callbacks
+):
+    post = post_with_image
+    post.image = make_image()
+    with django_capture_on_commit_callbacks(execute=True):
+        post.save()
+    post.refresh_from_db()
+    assert post.image_renditions == {}, (
+        "Убедитесь, что копии не кодируются во время запроса."
+    )
+    assert 'type="image/webp"' not in client.get("/").content.decode()
+
+    call_command("generate_renditions", workers=1)
+    post.refresh_from_db()
+    assert post.image_renditions == {"webp": [320, 640], "jpeg": [320, 640]}, (
+        "Убедитесь, что при загрузке картинки строятся уменьшенные копии"
+        " без увеличения исходника."
+    )
+    small = media_root / rendition_name(post.image.name, 320, "webp")
+    with Image.open(small) as image:
+        assert image.format == "WEBP"
+        assert image.size == (320, 192)
+
+    content = client.get("/").content.decode("utf-8")
+    assert 'type="image/webp"' in content, (
+        "Убедитесь, что готовые копии сбрасывают кеш страниц с постом."
+    )
+    assert f"{rendition_name(post.image.url, 640, 'webp')} 640w" in content
+
+
+def test_backfill_skips_done_posts(post_with_image, media_root):
+    post = post_with_image
+    post.image = make_image(width=200, height=100)
+    post.save()
+    assert post.image_renditions == {}
+
+    call_command("generate_renditions", batch_size=1, workers=1)
+    post.refresh_from_db()
+    assert post.image_renditions == {"webp": [200], "jpeg": [200]}
+
+    (media_root / rendition_name(post.image.name, 200, "webp")).unlink()
+    call_command("generate_renditions", workers=1)
+    assert not (
+        media_root / rendition_name(post.image.name, 200, "webp")
+    ).exists(), "Убедитесь, что повторный запуск пропускает готовые посты."
+
+
+def test_new_image_resets_renditions(post_with_image):
+    post = post_with_image
+    Post.objects.filter(pk=post.pk).update(
+        image="image/old.png", image_renditions={"jpeg": [320]}
+    )
+    post.refresh_from_db()
+    post.image = make_image()
+    post.save()
+    post.refresh_from_db()
+    assert post.image_renditions == {}
+
+
+def test_upload_stores_image_info(client, post_with_image):
+    post = post_with_image
+    upload = make_image(width=400, height=300)
+    post.image = upload
+    post.save()
+    info = Post.objects.with_related().get(pk=post.pk).image_info
+    assert (info.width, info.height, info.size) == (400, 300, upload.size), (
+        "Убедитесь, что размеры и объём картинки сохраняются при загрузке."
+    )
+    assert len(info.sha256) == 64
+
+    content = client.get(f"/posts/{post.id}/").content.decode("utf-8")
+    assert 'width="400" height="300"' in content
+    content = client.get("/").content.decode("utf-8")
+    assert 'loading="lazy"' in content
+
+
+def test_describe_images_backfill(post_with_image):
+    post = post_with_image
+    post.image = make_image(width=120, height=80)
+    post.save()
+    post.image_meta.delete()
+
+    call_command("describe_images", workers=2)
+    post.refresh_from_db()
+    assert (post.image_meta.width, post.image_meta.height) == (120, 80)
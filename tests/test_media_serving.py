@@ -0,0 +1,91 @@
+import pytest
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+
+DATA = bytes(range(256)) * 4
+
+
+@pytest.fixture(autouse=True)
+def media_root(settings, tmp_path):
+    settings.MEDIA_ROOT = tmp_path
+    settings.MEDIA_SENDFILE = None
+    return tmp_path
+
+
+@pytest.fixture
+def blob():
+    return default_storage.save("photo.jpg", ContentFile(DATA))
+
+
+def content(response):
+    return b"".join(response.streaming_content)
+
+
+def test_blob_is_cached_forever(client, blob):
+    response = client.get(f"/media/{blob}")
+    assert response.status_code == 200
+    assert content(response) == DATA
+    assert response["Content-Type"] == "image/jpeg"
+    assert response["Accept-Ranges"] == "bytes"
+    assert "immutable" in response["Cache-Control"], (
+        "Убедитесь, что файлы с хешем в имени кешируются навсегда."
+    )
+    response = client.get(
+        f"/media/{blob}", HTTP_IF_NONE_MATCH=response["ETag"]
+    )
+    assert response.status_code == 304
+
+
+def test_mutable_name_has_short_cache(client, media_root, settings):
+    (media_root / "image").mkdir()
+    (media_root / "image" / "old.png").write_bytes(DATA)
+    response = client.get("/media/image/old.png")
+    assert response["Cache-Control"] == (
+        f"public, max-age={settings.MEDIA_MAX_AGE}"
+    )
+    assert client.get("/media/image/missing.png").status_code == 404
+    assert client.get("/media/../settings.py").status_code == 404
+    assert client.post("/media/image/old.png").status_code == 405
+
+
+@pytest.mark.parametrize("header, status, expected, content_range", [
+    ("bytes=0-9", 206, DATA[:10], "bytes 0-9/1024"),
+    ("bytes=1000-", 206, DATA[1000:], "bytes 1000-1023/1024"),
+    ("bytes=-4", 206, DATA[-4:], "bytes 1020-1023/1024"),
+    ("bytes=1020-5000", 206, DATA[1020:], "bytes 1020-1023/1024"),
+    ("bytes=0-1,5-6", 200, DATA, None),
+    ("bytes=2000-", 416, None, "bytes */1024"),
+])
+def test_range_requests(client, blob, header, status, expected,
+                        content_range):
+    response = client.get(f"/media/{blob}", HTTP_RANGE=header)
+    assert response.status_code == status, (
+        "Убедитесь, что медиафайлы поддерживают запросы диапазона байт."
+    )
+    if expected is not None:
+        assert content(response) == expected
+        assert int(response["Content-Length"]) == len(expected)
+    assert response.get("Content-Range") == content_range
+
+
+def test_if_range_with_stale_etag_returns_whole_file(client, blob):
+    response = client.get(
+        f"/media/{blob}", HTTP_RANGE="bytes=0-9", HTTP_IF_RANGE='"stale"'
+    )
+    assert response.status_code == 200
+    assert content(response) == DATA
+
+
+@pytest.mark.parametrize("mode, header, value", [
+    ("x-accel-redirect", "X-Accel-Redirect", "/protected-media/{blob}"),
+    ("x-sendfile", "X-Sendfile", "{root}/{blob}"),
+])
+def test_sendfile_offload(client, settings, media_root, blob, mode, header,
+                          value):
+    settings.MEDIA_SENDFILE = mode
+    response = client.get(f"/media/{blob}")
+    assert response[header] == value.format(root=media_root, blob=blob), (
+        "Убедитесь, что отдачу файла можно передать веб-серверу."
+    )
+    assert response.content == b""
+    assert "immutable" in response["Cache-Control"]
@@ -0,0 +1,129 @@
+import os
+from io import BytesIO
+
+import pytest
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.management import call_command
+from PIL import Image
+
+from blog.images import refresh_renditions, rendition_name
+from blog.models import MediaBlob
+
+pytestmark = [pytest.mark.django_db]
+
+
+@pytest.fixture(autouse=True)
+def media_root(settings, tmp_path):
+    settings.MEDIA_ROOT = tmp_path
+    settings.POST_IMAGE_WIDTHS = (320,)
+    return tmp_path
+
+
+def make_image(color="teal", name="photo.png"):
+    output = BytesIO()
+    Image.new("RGB", (400, 200), color).save(output, "PNG")
+    return SimpleUploadedFile(name, output.getvalue(), "image/png")
+
+
+class NoEncoding:
+    def submit(self, *args):
+        raise AssertionError("Копия перекодирована повторно.")
+
+
+@pytest.fixture
+def make_post(mixer, user, published_category):
+    def make_post(image, author=user):
+        post = mixer.blend(
+            "blog.Post", author=author, category=published_category,
+            image=None,
+        )
+        post.image = image
+        post.save()
+        return post
+    return make_post
+
+
+def blob_files(media_root):
+    return sorted(
+        os.path.relpath(os.path.join(path, name), media_root)
+        for path, _, names in os.walk(media_root) for name in names
+    )
+
+
+def test_identical_uploads_share_one_blob(make_post, another_user, media_root):
+    first = make_post(make_image(name="a.png"))
+    second = make_post(make_image(name="B.PNG"), author=another_user)
+    assert first.image.name == second.image.name, (
+        "Убедитесь, что одинаковые загрузки получают одно имя файла."
+    )
+    assert first.image.name.startswith("blobs/")
+    assert len(blob_files(media_root)) == 1
+    assert MediaBlob.objects.get(name=first.image.name).refcount == 2
+
+    refresh_renditions([first])
+    assert refresh_renditions([second], NoEncoding()) == [{
+        "webp": [320], "jpeg": [320],
+    }], "Убедитесь, что готовые копии одинаковой картинки не кодируются."
+
+
+def test_collect_media_keeps_referenced_blobs(
+        make_post, another_user, media_root
+):
+    shared = make_post(make_image())
+    other = make_post(make_image(), author=another_user)
+    kept = make_post(make_image("navy"), author=another_user)
+    refresh_renditions([shared])
+
+    other.delete()
+    call_command("collect_media", grace=0)
+    assert os.path.exists(shared.image.path), (
+        "Убедитесь, что файл остаётся, пока на него есть ссылки."
+    )
+
+    shared.author.delete()
+    assert MediaBlob.objects.get(name=shared.image.name).refcount == 0
+    call_command("collect_media", grace=0, dry_run=True)
+    assert len(blob_files(media_root)) == 4
+
+    call_command("collect_media", grace=0, batch_size=1)
+    assert blob_files(media_root) == [kept.image.name], (
+        "Убедитесь, что collect_media удаляет файлы без ссылок вместе"
+        " с копиями."
+    )
+    assert not MediaBlob.objects.filter(name=shared.image.name).exists()
+    assert not os.path.exists(
+        media_root / rendition_name(shared.image.name, 320, "webp")
+    )
+
+
+def test_collect_media_spares_fresh_files(make_post, media_root):
+    post = make_post(make_image())
+    post.delete()
+    call_command("collect_media")
+    assert os.path.exists(post.image.path), (
+        "Убедитесь, что свежие файлы не удаляются: пост с ними может быть"
+        " ещё не сохранён."
+    )
+
+
+def test_renditions_of_legacy_image_keep_their_names(make_post, media_root):
+    post = make_post(None)
+    name = "image/2020/01/01/old.png"
+    (media_root / "image/2020/01/01").mkdir(parents=True)
+    (media_root / name).write_bytes(make_image().read())
+    (media_root / rendition_name(name, 320, "jpeg")).write_bytes(b"stale")
+    post.image = name
+    post.save()
+
+    assert refresh_renditions([post]) == [{"webp": [320], "jpeg": [320]}]
+    for fmt in ("webp", "jpeg"):
+        path = media_root / rendition_name(name, 320, fmt)
+        with Image.open(path) as image:
+            assert image.width == 320, (
+                "Убедитесь, что копии старой картинки сохраняются под"
+                " именами из srcset."
+            )
+    assert not os.path.exists(media_root / "blobs"), (
+        "Убедитесь, что производные файлы не переименовываются по хешу."
+    )
+
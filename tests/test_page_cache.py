@@ -0,0 +1,193 @@
+import socketserver
+import threading
+import time
+
+import pytest
+from django.core.cache import caches
+from django.test import override_settings
+
+from blog import page_cache
+
+pytestmark = [pytest.mark.django_db]
+
+
+@pytest.fixture(autouse=True)
+def clear_page_cache():
+    page_cache.get_cache().clear()
+    yield
+    page_cache.get_cache().clear()
+
+
+class RespStandIn(socketserver.StreamRequestHandler):
+    """Минимальный сервер с протоколом Redis для тестов бэкенда."""
+
+    def read_command(self):
+        line = self.rfile.readline()
+        if not line:
+            return None
+        args = []
+        for _ in range(int(line[1:])):
+            length = int(self.rfile.readline()[1:])
+            args.append(self.rfile.read(length + 2)[:-2])
+        return args
+
+    def handle(self):
+        self.data, self.expires = self.server.data, self.server.expires
+        while (args := self.read_command()) is not None:
+            for key, deadline in list(self.expires.items()):
+                if deadline < time.monotonic():
+                    self.data.pop(key, None)
+                    del self.expires[key]
+            command = getattr(self, f"do_{args[0].decode().lower()}")
+            self.wfile.write(self.encode(command(*args[1:])))
+
+    def expire(self, key, milliseconds):
+        self.expires[key] = time.monotonic() + int(milliseconds) / 1000
+
+    def do_get(self, key):
+        return self.data.get(key)
+
+    def do_mget(self, *keys):
+        return [self.data.get(key) for key in keys]
+
+    def do_set(self, key, value, *flags):
+        flags = [flag.upper() for flag in flags]
+        if b"NX" in flags and key in self.data:
+            return None
+        self.data[key] = value
+        self.expires.pop(key, None)
+        if b"PX" in flags:
+            self.expire(key, flags[flags.index(b"PX") + 1])
+        return "OK"
+
+    def do_incrby(self, key, delta):
+        self.data[key] = str(int(self.data[key]) + int(delta)).encode()
+        return int(self.data[key])
+
+    def do_exists(self, key):
+        return int(key in self.data)
+
+    def do_del(self, key):
+        return int(self.data.pop(key, None) is not None)
+
+    def do_pexpire(self, key, milliseconds):
+        self.expire(key, milliseconds)
+        return int(key in self.data)
+
+    def do_flushdb(self):
+        self.data.clear()
+        return "OK"
+
+    @staticmethod
+    def encode(reply):
+        if reply is None:
+            return b"$-1\r\n"
+        if isinstance(reply, str):
+            return f"+{reply}\r\n".encode()
+        if isinstance(reply, int):
+            return f":{reply}\r\n".encode()
+        if isinstance(reply, list):
+            return b"*%d\r\n" % len(reply) + b"".join(
+                map(RespStandIn.encode, reply)
+            )
+        return b"$%d\r\n%s\r\n" % (len(reply), reply)
+
+
+@pytest.fixture
+def resp_server():
+    server = socketserver.ThreadingTCPServer(("127.0.0.1", 0), RespStandIn)
+    server.daemon_threads = True
+    server.data, server.expires = {}, {}
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    yield f"redis://127.0.0.1:{server.server_address[1]}/0"
+    server.shutdown()
+    server.server_close()
+
+
+def test_anonymous_feed_is_served_from_cache(
+        client, user_client, post_with_published_location
+):
+    assert client.get("/")["X-Page-Cache"] == "miss"
+    response = client.get("/")
+    assert response["X-Page-Cache"] == "hit", (
+        "Убедитесь, что повторный анонимный запрос ленты отдаётся из кеша."
+    )
+    assert post_with_published_location.title in response.content.decode()
+    assert "X-Page-Cache" not in user_client.get("/")
+    assert page_cache.get_stats() == {"hits": 1, "misses": 1}
+
+
+def test_comment_invalidates_feed_pages(
+        mixer, client, post_with_published_location, another_category
+):
+    post = post_with_published_location
+    pages = ["/", f"/category/{post.category.slug}/",
+             f"/profile/{post.author.username}/"]
+    other_page = f"/category/{another_category.slug}/"
+    for url in [*pages, other_page]:
+        client.get(url)
+    mixer.blend("blog.Comment", post=post, author=post.author)
+    for url in pages:
+        response = client.get(url)
+        assert response["X-Page-Cache"] == "miss", (
+            "Убедитесь, что новый комментарий сбрасывает кеш страниц с"
+            " карточкой публикации."
+        )
+        assert "Комментарии (1)" in response.content.decode()
+    assert client.get(other_page)["X-Page-Cache"] == "hit"
+
+
+def test_category_change_invalidates_everything(
+        client, post_with_published_location
+):
+    client.get("/")
+    post_with_published_location.category.title = "Новое название"
+    post_with_published_location.category.save()
+    response = client.get("/")
+    assert response["X-Page-Cache"] == "miss"
+    assert "Новое название" in response.content.decode()
+
+
+def test_resp_backend(resp_server):
+    with override_settings(CACHES={
+        "default": {
+            "BACKEND": "blogicum.cache_backends.RespCache",
+            "LOCATION": resp_server,
+        },
+    }):
+        cache = caches["default"]
+        cache.set("page", {"html": "<p>"}, 30)
+        assert cache.get("page") == {"html": "<p>"}
+        assert not cache.add("page", "other")
+        assert cache.add("counter", 1)
+        assert cache.incr("counter", 5) == 6
+        with pytest.raises(ValueError):
+            cache.incr("missing")
+        assert cache.get_many(["page", "counter", "missing"]) == {
+            "page": {"html": "<p>"}, "counter": 6,
+        }
+        assert cache.delete("page")
+        assert cache.get("page", "default") == "default"
+        cache.set("short", 1, 0.01)
+        time.sleep(0.02)
+        assert "short" not in cache
+        cache.clear()
+        assert cache.get("counter") is None
+        cache.disconnect()
+
+
+def test_page_cache_over_resp(
+        resp_server, client, post_with_published_location
+):
+    with override_settings(CACHES={
+        "default": {
+            "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+        },
+        "pages": {
+            "BACKEND": "blogicum.cache_backends.RespCache",
+            "LOCATION": resp_server,
+        },
+    }):
+        assert client.get("/")["X-Page-Cache"] == "miss"
+        assert client.get("/")["X-Page-Cache"] == "hit"
+        page_cache.get_cache().disconnect()
@@ -0,0 +1,46 @@
+import pytest
+from django.core.cache import caches
+
+from blog.models import Post
+
+pytestmark = [pytest.mark.django_db]
+
+
+@pytest.fixture(autouse=True)
+def clear_fragments():
+    caches["template_fragments"].clear()
+    yield
+    caches["template_fragments"].clear()
+
+
+def test_card_is_cached_until_content_changes(
+        user_client, post_with_published_location
+):
+    post = post_with_published_location
+    user_client.get("/")
+    # Обновление без save() не меняет версию, и карточка берётся из кеша.
+    Post.objects.filter(pk=post.pk).update(title="Без новой версии")
+    content = user_client.get("/").content.decode("utf-8")
+    assert "Без новой версии" not in content, (
+        "Убедитесь, что карточки публикаций в ленте кешируются."
+    )
+
+    post.title = "Новый заголовок"
+    post.save()
+    content = user_client.get("/").content.decode("utf-8")
+    assert "Новый заголовок" in content, (
+        "Убедитесь, что изменение публикации обновляет её карточку."
+    )
+
+
+def test_card_follows_related_objects(
+        user_client, mixer, post_with_published_location
+):
+    post = post_with_published_location
+    user_client.get("/")
+    post.location.name = "Новое место"
+    post.location.save()
+    mixer.blend("blog.Comment", post=post, author=post.author)
+    content = user_client.get("/").content.decode("utf-8")
+    assert "Новое место" in content
+    assert "Комментарии (1)" in content
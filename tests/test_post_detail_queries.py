@@ -0,0 +1,65 @@
+from http import HTTPStatus
+
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from blog.models import Comment
+
+pytestmark = [pytest.mark.django_db]
+
+
+def detail_queries(client, post):
+    with CaptureQueriesContext(connection) as queries:
+        response = client.get(f"/posts/{post.id}/")
+    assert response.status_code == HTTPStatus.OK
+    return len(queries)
+
+
+@pytest.mark.parametrize("client_name", ["user_client", "unlogged_client"])
+def test_detail_query_count_is_fixed(
+        request, client_name, mixer, post_with_published_location
+):
+    client = request.getfixturevalue(client_name)
+    post = post_with_published_location
+    mixer.blend(Comment, post=post)
+    with_one_comment = detail_queries(client, post)
+
+    mixer.cycle(5).blend(Comment, post=post)
+    assert detail_queries(client, post) == with_one_comment, (
+        "Убедитесь, что число запросов к базе на странице публикации не"
+        " зависит от количества комментариев."
+    )
+
+
+def test_post_lookup_is_single_query(
+        unlogged_client, post_with_published_location
+):
+    assert detail_queries(unlogged_client, post_with_published_location) == 2
+
+
+def test_hidden_post_visible_only_to_author(
+        user_client, another_user_client, post_with_published_location
+):
+    post = post_with_published_location
+    post.is_published = False
+    post.save()
+    url = f"/posts/{post.id}/"
+    assert user_client.get(url).status_code == HTTPStatus.OK
+    assert another_user_client.get(url).status_code == HTTPStatus.NOT_FOUND
+
+
+def test_edit_loads_post_once(user_client, post_with_published_location):
+    post = post_with_published_location
+    with CaptureQueriesContext(connection) as queries:
+        response = user_client.get(f"/posts/{post.id}/edit/")
+    assert response.status_code == HTTPStatus.OK
+    post_selects = [
+        query["sql"] for query in queries
+        if query["sql"].startswith("SELECT")
+        and 'FROM "blog_post"' in query["sql"]
+    ]
+    assert len(post_selects) == 1, (
+        "Убедитесь, что при редактировании публикация загружается из базы"
+        " один раз за запрос."
+    )
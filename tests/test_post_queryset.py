@@ -0,0 +1,64 @@
+from datetime import timedelta
+
+import pytest
+from django.contrib.auth.models import AnonymousUser
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+
+from blog.models import Post
+
+pytestmark = [pytest.mark.django_db]
+
+
+@pytest.fixture
+def hidden_post(mixer, user, published_category):
+    return mixer.blend(
+        "blog.Post",
+        author=user,
+        category=published_category,
+        pub_date=timezone.now() + timedelta(days=1),
+    )
+
+
+def test_for_viewer_shows_own_hidden_posts(
+        user, another_user, post_with_published_location, hidden_post
+):
+    assert set(Post.objects.published()) == {post_with_published_location}
+    assert set(Post.objects.for_viewer(AnonymousUser())) == {
+        post_with_published_location
+    }
+    assert set(Post.objects.for_viewer(another_user)) == {
+        post_with_published_location
+    }
+    assert set(Post.objects.for_viewer(user)) == {
+        post_with_published_location, hidden_post
+    }
+
+
+def test_feed_cards_do_not_load_full_text(
+        user_client, mixer, user, published_category, published_location
+):
+    mixer.cycle(5).blend(
+        "blog.Post",
+        author=user,
+        category=published_category,
+        location=published_location,
+        text="слово " * 1000,
+    )
+    with CaptureQueriesContext(connection) as queries:
+        response = user_client.get("/")
+    post_selects = [
+        query["sql"] for query in queries
+        if 'FROM "blog_post"' in query["sql"]
+    ]
+    assert len(post_selects) == 1, (
+        "Убедитесь, что карточки ленты не подгружают поля публикации"
+        " отдельными запросами."
+    )
+    assert '"blog_post"."text"' not in post_selects[0].split("SUBSTR")[0], (
+        "Убедитесь, что для карточек в ленте текст публикации не"
+        " загружается целиком."
+    )
+    card_text = response.context["page_obj"][0].excerpt
+    assert len(card_text) < len("слово " * 1000)
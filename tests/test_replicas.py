@@ -0,0 +1,58 @@
+from django.http import HttpResponse
+from django.test import RequestFactory, override_settings
+
+from blog.api import CommentListApiView, PostDetailApiView, PostListApiView
+from blog.models import Post
+from blog.views import IndexListView, PostCreateView
+from blogicum.replicas import PIN_COOKIE, ReplicaMiddleware, ReplicaRouter
+
+
+def route_read(request, view):
+    routed = []
+
+    def get_response(request):
+        middleware.process_view(request, view, (), {})
+        routed.append(ReplicaRouter().db_for_read(Post))
+        return HttpResponse()
+
+    middleware = ReplicaMiddleware(get_response)
+    response = middleware(request)
+    return routed[0], response
+
+
+@override_settings(DATABASE_REPLICAS=["replica"], REPLICA_PIN_SECONDS=5)
+def test_reads_go_to_replica_until_user_writes():
+    factory = RequestFactory()
+    index = IndexListView.as_view()
+
+    db, _ = route_read(factory.get("/"), index)
+    assert db == "replica", (
+        "Убедитесь, что лента читается из реплики."
+    )
+
+    db, response = route_read(
+        factory.post("/posts/create/"), PostCreateView.as_view()
+    )
+    assert db == "default"
+    assert response.cookies[PIN_COOKIE]["max-age"] == 5
+
+    request = factory.get("/")
+    request.COOKIES[PIN_COOKIE] = "1"
+    db, _ = route_read(request, index)
+    assert db == "default", (
+        "Убедитесь, что после записи пользователь читает из основной базы."
+    )
+    assert ReplicaRouter().db_for_read(Post) == "default"
+
+
+@override_settings(DATABASE_REPLICAS=["replica"])
+def test_api_reads_viewer_posts_from_primary():
+    request = RequestFactory().get("/api/v1/posts/")
+    db, _ = route_read(request, PostListApiView.as_view())
+    assert db == "replica"
+    for view in (PostDetailApiView, CommentListApiView):
+        db, _ = route_read(request, view.as_view())
+        assert db == "default", (
+            "Убедитесь, что API с отложенными постами автора читает из"
+            " основной базы: реплика может отставать дольше закрепления."
+        )
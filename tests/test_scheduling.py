@@ -0,0 +1,72 @@
+from datetime import timedelta
+
+import pytest
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from django.utils import timezone
+
+from blog.caching import get_feed_version
+from blog.models import ScheduledPublication
+from blog.scheduling import (next_publication_time, post_published,
+                             publish_due)
+
+pytestmark = [pytest.mark.django_db]
+
+
+@pytest.fixture
+def future_post(mixer, user, published_category):
+    return mixer.blend(
+        "blog.Post",
+        author=user,
+        category=published_category,
+        pub_date=timezone.now() + timedelta(hours=1),
+    )
+
+
+def test_future_post_is_queued(future_post):
+    assert next_publication_time() == future_post.pub_date, (
+        "Убедитесь, что пост с датой публикации в будущем попадает в"
+        " очередь планировщика."
+    )
+    future_post.pub_date = timezone.now() - timedelta(minutes=1)
+    future_post.save()
+    assert not ScheduledPublication.objects.exists()
+
+
+def test_due_post_fires_event(future_post):
+    fired = []
+
+    def receiver(sender, instance, **kwargs):
+        fired.append(instance)
+
+    post_published.connect(receiver)
+    try:
+        assert publish_due() == []
+        version = get_feed_version()
+        published = publish_due(now=future_post.pub_date)
+    finally:
+        post_published.disconnect(receiver)
+    assert published == fired == [future_post]
+    assert get_feed_version() != version, (
+        "Убедитесь, что при наступлении даты публикации сбрасываются"
+        " кеши ленты."
+    )
+    assert next_publication_time() is None
+
+
+def test_command_once_keeps_future_posts(future_post):
+    call_command("publish_scheduled", once=True, allow_local_cache=True)
+    assert ScheduledPublication.objects.filter(post=future_post).exists()
+
+
+def test_command_requires_shared_cache(settings, tmp_path):
+    with pytest.raises(CommandError, match="default, pages"):
+        call_command("publish_scheduled", once=True)
+    settings.CACHES = {
+        **settings.CACHES,
+        **{alias: {
+            "BACKEND": "django.core.cache.backends.filebased.FileBasedCache",
+            "LOCATION": tmp_path / alias,
+        } for alias in ("default", "pages")},
+    }
+    call_command("publish_scheduled", once=True)
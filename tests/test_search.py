@@ -0,0 +1,104 @@
+from datetime import timedelta
+from http import HTTPStatus
+
+import pytest
+from django.core.management import call_command
+from django.db import connection
+from django.utils import timezone
+
+from blog.models import Post
+from conftest import make_cursor
+
+pytestmark = [pytest.mark.django_db]
+
+
+@pytest.fixture
+def searchable_posts(mixer, user, published_category):
+    past = timezone.now() - timedelta(days=1)
+    return {
+        "title": mixer.blend(
+            Post, author=user, category=published_category, pub_date=past,
+            title="Прогулка по Карелии", text="Озёра и сосны.",
+        ),
+        "text": mixer.blend(
+            Post, author=user, category=published_category, pub_date=past,
+            title="Заметки", text="Снова был в Карелии, Карелия прекрасна.",
+        ),
+        "hidden": mixer.blend(
+            Post, author=user, category=published_category, pub_date=past,
+            title="Карелия зимой", text="Черновик.", is_published=False,
+        ),
+        "other": mixer.blend(
+            Post, author=user, category=published_category, pub_date=past,
+            title="Москва", text="Город.",
+        ),
+    }
+
+
+def found_ids(client, query):
+    response = client.get("/search/", {"q": query})
+    assert response.status_code == HTTPStatus.OK
+    return {post.id for post in response.context["page_obj"]}
+
+
+def test_search_applies_visibility(unlogged_client, searchable_posts):
+    assert found_ids(unlogged_client, "карел") == {
+        searchable_posts["title"].id, searchable_posts["text"].id
+    }, (
+        "Убедитесь, что поиск находит публикации по заголовку и тексту и"
+        " не показывает скрытые публикации."
+    )
+    assert found_ids(unlogged_client, "") == set()
+    assert found_ids(unlogged_client, '"(*') == set()
+
+
+def test_search_index_follows_edits(unlogged_client, searchable_posts):
+    post = searchable_posts["other"]
+    post.text = "Проездом из Карелии."
+    post.save()
+    assert post.id in found_ids(unlogged_client, "Карелии")
+    post.delete()
+    assert post.id not in found_ids(unlogged_client, "Карелии")
+
+
+def test_rebuild_search_index(unlogged_client, searchable_posts):
+    with connection.cursor() as cursor:
+        cursor.execute("INSERT INTO blog_post_fts(blog_post_fts) "
+                       "VALUES ('delete-all')")
+    assert found_ids(unlogged_client, "Москва") == set()
+    call_command("rebuild_search_index")
+    assert found_ids(unlogged_client, "Москва") == {
+        searchable_posts["other"].id
+    }
+
+
+def test_search_cursor_pages(unlogged_client, mixer, user, published_category):
+    past = timezone.now() - timedelta(days=1)
+    posts = mixer.cycle(15).blend(
+        Post, author=user, category=published_category, pub_date=past,
+        title="Байкал", text=mixer.sequence(lambda i: "Байкал " * (i + 1)),
+    )
+    response = unlogged_client.get("/search/", {"q": "байкал"})
+    page = response.context["page_obj"]
+    seen = [post.id for post in page]
+    assert "q=%D0%B1%D0%B0%D0%B9%D0%BA%D0%B0%D0%BB&amp;after=" in (
+        response.content.decode("utf-8")
+    )
+    response = unlogged_client.get(
+        "/search/", {"q": "байкал", "after": page.next_cursor}
+    )
+    seen += [post.id for post in response.context["page_obj"]]
+    assert sorted(seen) == sorted(post.id for post in posts)
+
+
+@pytest.mark.parametrize("position", [
+    ["2020-01-01T00:00:00", 1], [True, 1], [-1.5, 1.5],
+])
+def test_search_cursor_of_wrong_type(unlogged_client, searchable_posts,
+                                     position):
+    response = unlogged_client.get(
+        "/search/", {"q": "карелия", "after": make_cursor(position)}
+    )
+    assert response.status_code == HTTPStatus.NOT_FOUND, (
+        "Убедитесь, что поиск отклоняет курсор с датой вместо ранга."
+    )
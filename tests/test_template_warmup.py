@@ -0,0 +1,34 @@
+from django.conf import settings
+from django.core.management import call_command
+from django.template.backends.django import DjangoTemplates
+
+from blogicum.template_warmup import uses_cached_loader, warm_templates
+
+
+def test_warmup_fills_cached_loader():
+    engine = DjangoTemplates({
+        "NAME": "warmup",
+        "DIRS": settings.TEMPLATES[0]["DIRS"],
+        "APP_DIRS": False,
+        "OPTIONS": {
+            "loaders": [("django.template.loaders.cached.Loader", [
+                "django.template.loaders.filesystem.Loader",
+                "django.template.loaders.app_directories.Loader",
+            ])],
+        },
+    })
+    assert uses_cached_loader(engine)
+    names = warm_templates(engine)
+    for name in ("base.html", "blog/index.html", "includes/post_card.html",
+                 "pages/about.html"):
+        assert name in names
+    loader = engine.engine.template_loaders[0]
+    assert "includes/post_card.html" in loader.get_template_cache, (
+        "Убедитесь, что шаблоны разбираются заранее и попадают в кеш"
+        " загрузчика."
+    )
+
+
+def test_warm_templates_command(capsys):
+    call_command("warm_templates")
+    assert "Разобрано шаблонов" in capsys.readouterr().out
@@ -0,0 +1,126 @@
+from io import BytesIO
+
+import pytest
+from django.core.files.uploadedfile import SimpleUploadedFile
+from PIL import Image, ImageCms, PngImagePlugin
+
+from blog.models import Post
+from blog.uploads import sniff
+
+pytestmark = [pytest.mark.django_db]
+
+
+@pytest.fixture(autouse=True)
+def media_root(settings, tmp_path):
+    settings.MEDIA_ROOT = tmp_path
+    return tmp_path
+
+
+@pytest.fixture
+def post_data(published_category):
+    return {
+        "title": "Фото",
+        "text": "Текст",
+        "category": published_category.pk,
+        "pub_date": "2020-01-01 00:00:00",
+        "is_published": True,
+    }
+
+
+def make_jpeg(size=(40, 20), **options):
+    output = BytesIO()
+    Image.new("RGB", size, "teal").save(output, "JPEG", **options)
+    return output.getvalue()
+
+
+def upload(user_client, post_data, name, data):
+    user_client.post("/posts/create/", {
+        **post_data,
+        "image": SimpleUploadedFile(name, data, "image/jpeg"),
+    })
+    return Post.objects.get()
+
+
+@pytest.mark.parametrize("head, expected", [
+    (make_jpeg()[:12], "JPEG"),
+    (b"\x89PNG\r\n\x1a\n\0\0\0\r", "PNG"),
+    (b"GIF89a\0\0\0\0\0\0", "GIF"),
+    (b"RIFF\0\0\0\0WEBPVP8 ", "WEBP"),
+    (b"<svg xmlns='h", None),
+])
+def test_sniff(head, expected):
+    assert sniff(head) == expected
+
+
+def test_exif_is_stripped_and_applied(user_client, user, post_data):
+    exif = Image.Exif()
+    exif[0x0112] = 6
+    exif[0x010F] = "Camera"
+    data = make_jpeg(exif=exif.tobytes())
+    post = upload(user_client, post_data, "photo.jpg", data)
+    with Image.open(post.image.path) as image:
+        assert not image.getexif(), (
+            "Убедитесь, что из загруженной картинки удаляются метаданные."
+        )
+        assert image.size == (20, 40), (
+            "Убедитесь, что картинка поворачивается по тегу Orientation."
+        )
+
+
+def test_color_profile_and_dpi_survive(user_client, post_data):
+    profile = ImageCms.ImageCmsProfile(ImageCms.createProfile("sRGB"))
+    exif = Image.Exif()
+    exif[0x0112] = 6
+    data = make_jpeg(
+        icc_profile=profile.tobytes(), dpi=(300, 300), exif=exif.tobytes()
+    )
+    post = upload(user_client, post_data, "photo.jpg", data)
+    with Image.open(post.image.path) as image:
+        assert not image.getexif()
+        assert image.info.get("icc_profile") == profile.tobytes(), (
+            "Убедитесь, что при удалении EXIF сохраняется ICC-профиль."
+        )
+        assert image.info.get("dpi") == (300, 300)
+
+
+def test_file_without_metadata_is_kept(user_client, post_data):
+    data = make_jpeg()
+    post = upload(user_client, post_data, "photo.jpg", data)
+    with post.image.open("rb"):
+        assert post.image.read() == data, (
+            "Убедитесь, что картинка без метаданных не сжимается повторно."
+        )
+
+
+def test_animation_keeps_frames(user_client, post_data):
+    text = PngImagePlugin.PngInfo()
+    text.add_text("Author", "Имя")
+    output = BytesIO()
+    Image.new("RGB", (40, 20), "teal").save(
+        output, "PNG", save_all=True, pnginfo=text,
+        append_images=[Image.new("RGB", (40, 20), "navy")],
+    )
+    post = upload(user_client, post_data, "anim.png", output.getvalue())
+    with Image.open(post.image.path) as image:
+        assert image.n_frames == 2, (
+            "Убедитесь, что у анимации не теряются кадры."
+        )
+        assert not image.text
+
+
+@pytest.mark.parametrize("name, data, error", [
+    ("photo.png", b"<script>alert(1)</script>", "в формате JPEG"),
+    ("photo.jpg", make_jpeg(size=(400, 400), quality=100), "больше"),
+])
+def test_rejected_upload(user_client, user, post_data, settings, name, data,
+                         error):
+    settings.POST_IMAGE_MAX_SIZE = 1000
+    response = user_client.post("/posts/create/", {
+        **post_data,
+        "image": SimpleUploadedFile(name, data, "image/png"),
+    })
+    assert error in response.content.decode(), (
+        "Убедитесь, что неподходящий файл отклоняется ещё при приёме"
+        " с понятной ошибкой в форме."
+    )
+    assert not Post.objects.filter(author=user).exists()